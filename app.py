@@ -1,10 +1,29 @@
-import streamlit as st
-import pandas as pd
-import google.generativeai as genai
-import gspread
-from google.oauth2.service_account import Credentials
 import time
+_run_started = time.perf_counter()
+
+import streamlit as st
+import os
+import tempfile
+from collections import deque
 from io import BytesIO
+from translation_memory import TranslationMemory, normalize_source, prompt_version
+from fuzzy_memory import FuzzyMemory
+from gemini_client import MODEL_NAME, get_model, stream_translation
+from prompts import CATEGORIES, LEVELS, build_master_prompt
+from pipeline import Translator, collect_items
+from metrics import MODEL_PRICES, percentile, to_json, to_prometheus
+from validation import RULE_LABELS
+from coalescing import StreamCoalescer
+from job_store import JobStore, make_job_id, file_fingerprint
+from job_runner import JobRunner
+from spreadsheet_io import count_rows, stream_translate_file
+from sheets_io import ChunkedSheetWriter, column_index, column_letter, read_columns
+from multi_sheet import (
+    cell_key, describe_cell, describe_tasks, gather_cells, make_writers, parse_job_spec, translate_cells
+)
+from delta import SourceHashStore, make_doc_key, is_unchanged, split_changed
+from scheduler import INTERACTIVE, BATCH, get_scheduler
+from estimator import estimate_job, describe_estimate, format_duration
 
 # 페이지 설정
 st.set_page_config(page_title="Uphone Translator V5", page_icon="⚡", layout="wide")
@@ -14,29 +33,72 @@ st.markdown("""
 **Google Sheets + 파일 업로드 + 실시간 번역 모두 지원**
 """)
 
-# Google Sheets 인증 함수
+# Google Sheets 인증 (세션 간 공유, 실패는 캐시하지 않아 설정 후 다시 시도 가능)
+# gspread / google-auth는 Sheets 탭에서 처음 쓸 때 불러옴
+@st.cache_resource
+def authorize_google_sheets():
+    import gspread
+    from google.oauth2.service_account import Credentials
+    
+    scope = [
+        'https://spreadsheets.google.com/feeds',
+        'https://www.googleapis.com/auth/drive'
+    ]
+    
+    if 'gcp_service_account' in st.secrets:
+        credentials = Credentials.from_service_account_info(
+            st.secrets["gcp_service_account"],
+            scopes=scope
+        )
+    else:
+        credentials = Credentials.from_service_account_file(
+            'service-account-key.json',
+            scopes=scope
+        )
+    
+    return gspread.authorize(credentials)
+
 def get_google_sheets_client():
     try:
-        scope = [
-            'https://spreadsheets.google.com/feeds',
-            'https://www.googleapis.com/auth/drive'
-        ]
-        
-        if 'gcp_service_account' in st.secrets:
-            credentials = Credentials.from_service_account_info(
-                st.secrets["gcp_service_account"],
-                scopes=scope
-            )
-        else:
-            credentials = Credentials.from_service_account_file(
-                'service-account-key.json',
-                scopes=scope
-            )
-        
-        return gspread.authorize(credentials)
+        return authorize_google_sheets()
     except Exception as e:
         return None
 
+# 번역 메모리 (세션 간 공유)
+@st.cache_resource
+def get_translation_memory():
+    return TranslationMemory()
+
+# 자리표시자 정규화 / 유사 문장 번역 메모리 (세션 간 공유)
+@st.cache_resource
+def get_fuzzy_memory():
+    return FuzzyMemory()
+
+# 작업 체크포인트 저장소 (세션 간 공유)
+@st.cache_resource
+def get_job_store():
+    return JobStore()
+
+# 백그라운드 작업 실행기 (프로세스 전체 공유)
+@st.cache_resource
+def get_job_runner():
+    return JobRunner()
+
+# Delta 모드 원문 해시 저장소 (세션 간 공유)
+@st.cache_resource
+def get_delta_store():
+    return SourceHashStore()
+
+# 스크립트 실행 시간 기록: 프로세스의 첫 실행(콜드 스타트)과 이후 재실행
+@st.cache_resource
+def get_run_timings():
+    return {"cold_start": None, "reruns": deque(maxlen=200)}
+
+# 실시간 번역 스트리밍 요청 병합 (프로세스 전체 공유)
+@st.cache_resource
+def get_stream_coalescer():
+    return StreamCoalescer()
+
 # ⭐ 사이드바 설정
 with st.sidebar:
     st.header("🔑 API Key 설정")
@@ -57,268 +119,232 @@ with st.sidebar:
     
     category = st.selectbox(
         "Category",
-        ["Daily Life", "Business", "Travel", "News", "Academic", "Entertainment", "Health", "Technology"]
+        CATEGORIES
     )
     
     level = st.selectbox(
         "Level",
-        ["Beginner", "Elementary", "Intermediate", "Advanced"]
+        LEVELS
     )
     
     st.divider()
     st.header("📊 Excel Columns")
     col_source = st.text_input("Source Column (English)", value="D")
     col_target = st.text_input("Target Column (Korean)", value="E")
+    
+    st.divider()
+    st.header("⚙️ Performance")
+    max_workers = st.slider("동시 요청 수", min_value=1, max_value=32, value=8)
+    rpm_limit = st.number_input("분당 요청 제한 (RPM)", min_value=1, max_value=10000, value=60, step=10)
+    key_concurrency = st.number_input("API 키 전체 동시 요청 수", min_value=1, max_value=128, value=16,
+                                      help="같은 API 키를 쓰는 모든 세션과 백그라운드 작업이 나눠 쓰는 한도입니다. "
+                                           "실시간 번역은 배치 작업보다 먼저 처리됩니다")
+    get_scheduler(api_key).set_limits(key_concurrency, rpm_limit)
+    delta_mode = st.checkbox("🔁 변경된 행만 번역 (Delta 모드)", value=False,
+                             help="번역이 이미 있고 지난 실행 이후 원문이 바뀌지 않은 행은 건너뜁니다")
+    batch_mode = st.checkbox("배치 모드 (여러 행을 한 번에 요청)", value=False)
+    if batch_mode:
+        batch_rows = st.number_input("배치당 최대 행 수", min_value=2, max_value=200, value=30)
+        batch_token_budget = st.number_input("배치당 토큰 예산", min_value=200, max_value=30000, value=3000, step=100)
+    validate_rows = st.checkbox("🔎 번역 검수 후 위반 행만 재번역", value=True,
+                                help="금지어(당신), 변수/굵게 표시 보존, 숫자 일치, -요/-습니다 혼용을 검사해 위반한 행만 고칠 점을 붙여 다시 요청합니다")
+    segment_chars = st.number_input("긴 셀 분할 기준 (글자 수, 0이면 끔)", min_value=0, max_value=20000, value=1500, step=100,
+                                    help="이보다 긴 셀은 문단/문장 경계에서 나눠 조각별로 병렬 번역한 뒤 다시 합칩니다")
+    hedge_calls = st.checkbox("🏁 느린 요청 헤징", value=False,
+                              help="이번 실행에서 잰 지연 시간의 백분위수를 넘긴 요청을 한 번 더 보내고 먼저 온 응답을 씁니다")
+    if hedge_calls:
+        hedge_percentile = st.slider("헤지 기준 백분위수", min_value=50, max_value=99, value=95)
+        hedge_max_extra = st.slider("추가 호출 한도 (%)", min_value=1, max_value=50, value=5)
+    fallback_model = st.selectbox("대체 모델 (거듭 느리거나 실패한 요청)",
+                                  ["사용 안 함"] + [name for name in MODEL_PRICES if name != MODEL_NAME])
+    
+    st.divider()
+    st.header("🧠 Translation Memory")
+    use_memory = st.checkbox("번역 메모리 사용", value=True)
+    if use_memory:
+        tm_stats = get_translation_memory().stats()
+        st.caption(f"저장 {tm_stats['entries']}건 · 적중 {tm_stats['hits']} · 미적중 {tm_stats['misses']} ({tm_stats['hit_rate']:.0%})")
+        use_fuzzy = st.checkbox("숫자/변수만 다른 문장 재사용 (유사 문장 참고)", value=True,
+                                help="숫자와 {변수}를 가린 원문이 같으면 기존 번역에 값만 바꿔 채우고, 비슷한 문장의 번역은 참고 예시로 보냅니다")
+        fuzzy_threshold = st.slider("유사 문장 기준", min_value=0.5, max_value=0.95, value=0.8, step=0.05,
+                                    disabled=not use_fuzzy)
+        if use_fuzzy:
+            fm_stats = get_fuzzy_memory().stats()
+            st.caption(f"템플릿 {fm_stats['entries']}건 · 템플릿 재사용 {fm_stats['template_hits']} · 유사 문장 참고 {fm_stats['near_hits']}")
+    else:
+        use_fuzzy = False
+        fuzzy_threshold = 0.8
+    # 기본값은 처음 한 번만 현재 적중률로 정함 (기본값이 바뀌면 위젯이 새로 만들어져 사용자가 고른 값이 사라짐)
+    st.session_state.setdefault("expected_hit_rate", int(tm_stats['hit_rate'] * 100) if use_memory else 0)
+    expected_hit_rate = st.slider(
+        "예상 메모리 적중률 (%)", min_value=0, max_value=100, key="expected_hit_rate",
+        help="사전 견적에서 번역 메모리로 바로 채워질 것으로 보는 고유 원문 비율입니다"
+    )
 
-# 프롬프트 로직
-ground_rules = """
-# 🛡️ Absolute Ground Rules (Non-negotiable)
-1. **Zero 'You' Policy:** NEVER translate 'You' as '당신'. Omit subject or use context-appropriate titles.
-2. **Anti-Passive Voice:** Use Active Voice. (X) "~에 의해 ~되다" -> (O) "강사가 취소했다"
-3. **Subject-Drop Freedom:** Omit unnecessary subjects (I/We) if context is clear.
-4. **Word Order Liberation:** Don't mimic English order. Rearrange for natural Korean flow.
-5. **Sentence Fusion:** Combine/split sentences for better rhythm.
-6. **Natural Predicate Choice:** Don't translate verbs 1:1. Use natural Korean predicates.
-7. **Connector Naturalization:** Avoid mechanical "And, But". Use natural endings (~하는데).
-8. **Tense Flexibility:** Don't force 'Have p.p'. Use context-based tense.
-9. **Pronoun Minimization:** Avoid repetitive He/She/It.
-10. **Formality Calibration:** Follow the Tone defined in Category settings.
-11. **No Hallucination:** Fact must match 100%. No adding/omitting info.
-12. **Bold/Tag Preservation:** Preserve markdown bold (`**`) and variables (`{name}`) exactly.
-"""
-
-common_errors = """
-# ⚠️ Common Translation Errors to AVOID
-1. **Spacing:** 문장 끝 다음 띄어쓰기, 쉼표 뒤 띄어쓰기, 조사 앞 붙여쓰기
-2. **Quotation:** 인용문 정확히 처리, 원문 없으면 따옴표 추가 금지
-3. **Parentheses:** 괄호 최소화 (유명 인명에 영어 표기 불필요)
-4. **Symbols:** 대시(—), 슬래시(/) 남용 금지
-5. **Entity Names:** 동일 회사/기관 표기 통일
-6. **Balance:** 자연스러운 의역 우선, 핵심 의미 누락 금지
-7. **Tone:** 한 문서 내 "-요"/"-습니다" 혼용 금지
-8. **Numbers:** 만/억 단위 사용, 쉼표 위치 확인
-9. **Connectors:** 원문 없는 "하지만", "특히" 추가 금지
-10. **Terms:** 전문 용어는 업계 표준 번역 사용
-"""
-
-# 카테고리별 상세 지침
-category_guidelines = {
-    "Daily Life": """
-**특징:**
-- 자연스러운 구어체 우선
-- 외래어보다 한국어 대체어 선호
-- 실생활 표현 그대로
-
-**기본 말투:** polite (~요)
-
-**말투 자동 조정:**
-- 원문에 casual 신호 (Wanna, Gonna, Dude, bro) → casual 전환
-- 원문에 formal 신호 (Would you, Could you, Sir/Ma'am) → formal 전환
-- 대화 맥락이 있으면 관계 파악하여 조정
-
-**예시:**
-- "Wanna grab lunch?" → casual → "점심 먹을래?"
-- "Would you like to have lunch?" → polite → "점심 드실래요?"
-- "Let's have lunch" → 기본 polite → "점심 먹어요"
-""",
-    
-    "Business": """
-**특징:**
-- 정중하고 전문적인 톤
-- 업무 용어는 외래어 허용 (미팅, 이메일, 리포트 등)
-- 격식 있는 표현
-
-**기본 말투:** polite~formal
-
-**예시:**
-- "Let's schedule a meeting" → "회의 일정을 잡겠습니다"
-- "I'll follow up on this" → "이 건은 제가 후속 조치하겠습니다"
-- "Could you review the proposal?" → "제안서 검토 부탁드립니다"
-""",
-    
-    "Travel": """
-**특징:**
-- 실용적이고 명확하게
-- 여행 상황별 맥락 반영
-- 지명/고유명사는 외래어 유지
-
-**기본 말투:** polite
-
-**예시:**
-- "Where's the nearest subway station?" → "가장 가까운 지하철역이 어디예요?"
-- "I'd like to check in" → "체크인하려고요"
-- "How much is this?" → "이거 얼마예요?"
-""",
-    
-    "News": """
-**특징:**
-- 객관적이고 간결한 서술
-- 감정 표현 배제
-- 사실 전달 중심
-- 전문 용어 정확히
-
-**기본 말투:** formal (-다/-습니다)
-
-**예시:**
-- "The company announced a major restructuring" → "회사는 대규모 구조조정을 발표했다"
-- "Experts predict economic growth will slow" → "전문가들은 경제 성장이 둔화될 것으로 예측한다"
-- "The government introduced new regulations" → "정부는 새로운 규제를 도입했다"
-""",
-    
-    "Academic": """
-**특징:**
-- 논리적이고 명확한 표현
-- 학술 용어 정확히
-- 논거가 분명하게
-
-**기본 말투:** polite~formal
-
-**예시:**
-- "In my opinion, this approach is more effective" → "제 생각에는 이 접근 방식이 더 효과적입니다"
-- "Research shows that students benefit from" → "연구에 따르면 학생들은 ~로부터 도움을 받는다"
-- "Let's discuss the pros and cons" → "장단점을 논의해 봅시다"
-""",
-    
-    "Entertainment": """
-**특징:**
-- 생동감 있고 재미있게
-- 감정/분위기 살리기
-- 유행어/신조어 적절히 활용
-
-**기본 말투:** casual~polite
-
-**예시:**
-- "That's hilarious!" → "완전 웃겨!" / "진짜 재밌네!"
-- "I'm a huge fan of this show" → "이 프로 완전 팬이야"
-- "The plot twist was amazing" → "반전이 대박이었어"
-""",
-    
-    "Health": """
-**특징:**
-- 정확하고 신중하게
-- 의학 용어는 한글 또는 설명 추가
-- 오해 없도록 명확히
-
-**기본 말투:** polite~formal
-
-**예시:**
-- "Take this medication twice a day" → "이 약은 하루 두 번 복용하세요"
-- "You should get enough rest" → "충분한 휴식이 필요합니다"
-- "Consult your doctor if symptoms persist" → "증상이 지속되면 의사와 상담하세요"
-""",
-    
-    "Technology": """
-**특징:**
-- 전문적이되 이해하기 쉽게
-- 기술 용어는 외래어 유지
-- 약어는 그대로 (API, AI, UI 등)
-
-**기본 말투:** polite~formal
-
-**예시:**
-- "Update the software to the latest version" → "소프트웨어를 최신 버전으로 업데이트하세요"
-- "The AI system processes data in real-time" → "AI 시스템은 데이터를 실시간으로 처리한다"
-- "Click on the settings icon" → "설정 아이콘을 클릭하세요"
-"""
-}
-
-# 레벨별 상세 지침
-level_guidelines = {
-    "Beginner": """
-**특징:**
-- 가장 기본적이고 쉬운 단어
-- 짧고 단순한 문장 구조
-- 한 문장에 하나의 의미만
-- 어려운 표현은 쉽게 풀어서
-
-**예시:**
-- "I'm feeling under the weather" → "몸이 안 좋아" / "아파"
-- "Let's call it a day" → "오늘은 여기까지 하자"
-- "I'm swamped with work" → "일이 너무 많아"
-""",
-    
-    "Elementary": """
-**특징:**
-- 일상적인 표현 사용
-- 기본적인 관용구 포함 가능
-- 자연스럽되 복잡하지 않게
-
-**예시:**
-- "I'm feeling under the weather" → "컨디션이 별로야"
-- "Let's call it a day" → "오늘은 이만 마무리하자"
-- "I'm swamped with work" → "일이 엄청 많아"
-""",
-    
-    "Intermediate": """
-**특징:**
-- 자연스러운 관용 표현 활용
-- 뉘앙스 살리기
-- 다양한 어휘 사용
-
-**예시:**
-- "I'm feeling under the weather" → "몸 상태가 좋지 않아"
-- "Let's call it a day" → "오늘은 여기서 마치자"
-- "I'm swamped with work" → "일에 치여 있어" / "일이 산더미야"
-""",
-    
-    "Advanced": """
-**특징:**
-- 원어민 수준의 자연스러움
-- 문화적 뉘앙스까지 반영
-- 상황에 따른 미묘한 차이 표현
+# 마스터 프롬프트 생성 ((카테고리, 레벨)마다 한 번만 만들고 재사용)
+master_prompt = build_master_prompt(category, level)
 
-**예시:**
-- "I'm feeling under the weather" → "몸이 영 개운치 않네"
-- "Let's call it a day" → "오늘은 이쯤에서 접자"
-- "I'm swamped with work" → "일에 파묻혀 있어" / "일 때문에 정신이 하나도 없어"
-"""
-}
+# 번역 실행 함수와 호출 제어기 생성 (캐시 리소스는 스크립트 스레드에서 미리 가져옴)
+def make_translator():
+    translator = Translator(
+        api_key, category, level,
+        max_workers=max_workers, limiter=get_scheduler(api_key).lane(BATCH),
+        batch_mode=batch_mode,
+        batch_rows=batch_rows if batch_mode else 30,
+        batch_token_budget=batch_token_budget if batch_mode else 3000,
+        memory=get_translation_memory() if use_memory else None,
+        fuzzy=get_fuzzy_memory() if use_fuzzy else None,
+        fuzzy_threshold=fuzzy_threshold,
+        segment_chars=segment_chars,
+        validate=validate_rows,
+        job_store=get_job_store(),
+        hedge=hedge_calls,
+        hedge_percentile=hedge_percentile if hedge_calls else 95,
+        hedge_max_extra=hedge_max_extra / 100 if hedge_calls else 0.05,
+        fallback_model=None if fallback_model == "사용 안 함" else fallback_model
+    )
+    controller = translator.new_controller()
+    
+    def run_translation(items, on_result, job_id=None, job_name="", resume=False, total=None, finish=True):
+        return translator.run(items, on_result, controller, job_id=job_id, job_name=job_name,
+                              resume=resume, total=total, finish=finish)
+    
+    return run_translation, controller, translator
 
-# 마스터 프롬프트 생성
-master_prompt = f"""
-You are Uphone's Localization Specialist.
-Translate the text from **English** to **Korean**.
+# 호출 제어 결과 요약
+def describe_run(controller, translator):
+    stats = controller.snapshot()
+    summary = translator.metrics.summary()
+    p95 = f"{summary['latency_p95']:.2f}s" if summary['latency_p95'] is not None else "-"
+    return (
+        f"동시성 {stats['concurrency']} · 429 {stats['rate_limited']}회 · "
+        f"일시 오류 {stats['transient_errors']}회 · 재시도 {stats['retries']}회 · 실패 {stats['failed_rows']}행 · "
+        f"p95 {p95} · 토큰 {summary['prompt_tokens'] + summary['output_tokens']:,}"
+        + (f" · {translator.validation.describe()}" if translator.validate else "")
+    )
 
-{ground_rules}
+# 지연 시간 / 토큰 / 비용 지표 패널 (JSON, Prometheus 내보내기 포함)
+def show_metrics(summary, key):
+    with st.expander("📊 호출 지표"):
+        cols = st.columns(4)
+        latency = lambda value: f"{value:.2f}s" if value is not None else "-"
+        cols[0].metric("p50 지연", latency(summary["latency_p50"]))
+        cols[1].metric("p95 지연", latency(summary["latency_p95"]))
+        cols[2].metric("p99 지연", latency(summary["latency_p99"]))
+        cols[3].metric("모델 호출", f"{summary['calls']:,}", f"오류 {summary['errors']}", delta_color="off")
+        cols = st.columns(4)
+        cols[0].metric("rows/s", f"{summary['rows_per_second']:.2f}")
+        cols[1].metric("tokens/s", f"{summary['tokens_per_second']:.0f}")
+        cols[2].metric("토큰 (입력/출력)", f"{summary['prompt_tokens']:,} / {summary['output_tokens']:,}")
+        cost = summary["estimated_cost_usd"]
+        cols[3].metric("예상 비용", f"${cost:.4f}" if cost is not None else "-")
+        st.caption(f"메모리 적중 {summary['cache_hits']}행 · 모델 요청 {summary['cache_misses']}행 · "
+                   f"재시도 {summary.get('retries', 0)}회")
+        if summary.get("hedged_calls") or summary.get("fallback_calls"):
+            st.caption(f"헤지 {summary['hedged_calls']}회 · 헤지 응답 채택 {summary['hedge_wins']}회 · "
+                       f"한도로 건너뜀 {summary['hedges_skipped']}회 · 대체 모델 호출 {summary['fallback_calls']}회")
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button("📥 JSON", to_json(summary), file_name="translation_metrics.json",
+                               mime="application/json", key=f"metrics_json_{key}")
+        with col2:
+            st.download_button("📥 Prometheus", to_prometheus(summary), file_name="translation_metrics.prom",
+                               mime="text/plain", key=f"metrics_prom_{key}")
 
-{common_errors}
+# 번역 시작 전 호출 수/토큰/비용/시간 견적 (모델은 호출하지 않음)
+def show_estimate(values):
+    estimate = estimate_job(
+        values, master_prompt, rpm=rpm_limit, max_workers=min(max_workers, key_concurrency),
+        batch_mode=batch_mode,
+        batch_rows=batch_rows if batch_mode else 30,
+        batch_token_budget=batch_token_budget if batch_mode else 3000,
+        cache_hit_rate=expected_hit_rate / 100, segment_chars=segment_chars
+    )
+    st.info(f"🧮 {describe_estimate(estimate)}")
+    cols = st.columns(4)
+    cols[0].metric("모델 호출", f"{estimate['calls']:,}")
+    cols[1].metric("토큰 (입력/출력)", f"{estimate['prompt_tokens']:,} / {estimate['output_tokens']:,}")
+    cost = estimate["estimated_cost_usd"]
+    cols[2].metric("예상 비용", f"${cost:.2f}" if cost is not None else "-")
+    cols[3].metric("예상 시간", format_duration(estimate["estimated_seconds"]))
+    st.caption(f"전체 {estimate['rows']:,}행 · 비어 있지 않은 셀 {estimate['non_empty']:,} · 고유 원문 {estimate['unique']:,} · "
+               f"분할 대상 긴 셀 {estimate['long_cells']:,} · 프롬프트 {estimate['system_prompt_tokens']:,}토큰/호출 "
+               f"(로컬 근사치)")
 
-# Category-Specific Guidelines
-[Category: {category}]
-{category_guidelines[category]}
+# 규칙별 검수 결과와 위반이 남은 행
+def show_validation(report, row_label=None):
+    summary = report.summary()
+    import pandas as pd
+    
+    with st.expander(f"🔎 번역 검수 · {report.describe()}"):
+        st.table(pd.DataFrame([
+            {"규칙": RULE_LABELS[rule], "발견": counts["detected"], "재번역으로 해결": counts["fixed"], "남음": counts["remaining"]}
+            for rule, counts in summary.items()
+        ]))
+        for row, violations in sorted(report.rows.items()):
+            for rule, detail in violations:
+                st.text(f"{row_label(row) if row_label else f'row {row + 1}'}: [{RULE_LABELS[rule]}] {detail}")
 
-# Level-Specific Guidelines
-[Level: {level}]
-{level_guidelines[level]}
+# 실패한 행 표시 (셀에는 쓰지 않음)
+def show_run_report(controller, translator, key, row_label=None):
+    st.caption(f"⚙️ {describe_run(controller, translator)}")
+    show_metrics(translator.metrics.summary(controller), key)
+    if translator.validate:
+        show_validation(translator.validation, row_label)
+    if controller.failures:
+        st.warning(f"⚠️ {len(controller.failures)}행은 재시도 후에도 번역하지 못해 비워 두었습니다. '작업 이어하기'로 다시 시도할 수 있습니다.")
+        with st.expander("실패한 행 보기"):
+            for index, reason in sorted(controller.failures.items()):
+                st.text(f"{row_label(index) if row_label else f'row {index + 1}'}: {reason}")
 
-[Technical Instruction]
-- AI will automatically detect content type (Dialogue/Script/Article) and adjust tone accordingly
-- Only output the translated Korean text
-- Do not add explanations
-"""
+# Delta 모드 적용: 바뀐 행만 남기고, 번역에 성공한 행의 원문 해시를 기록하는 함수를 함께 반환
+def prepare_delta(items, df, idx_tgt, doc_key):
+    import pandas as pd
+    
+    store = get_delta_store()
+    skipped = 0
+    if delta_mode and idx_tgt < len(df.columns):
+        targets = {}
+        for index, _ in items:
+            value = df.iat[index, idx_tgt]
+            targets[index] = str(value) if pd.notna(value) else ""
+        items, skipped = split_changed(items, targets, store.hashes(doc_key))
+    
+    sources = dict(items)
+    
+    def record(index, translated_text):
+        if translated_text is not None:
+            store.record(doc_key, index, sources[index])
+    
+    return items, skipped, record
 
-# 번역 함수
-def translate_text(text):
-    try:
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel('gemini-2.5-flash')
-        response = model.generate_content(
-            f"{master_prompt}\n\n[Source Text]: {text}\n[Translation]:"
-        )
-        return response.text.strip()
-    except Exception as e:
-        return f"Error: {e}"
+# 결과 파일 생성
+def dataframe_to_bytes(df, as_csv=False):
+    import pandas as pd
+    
+    output = BytesIO()
+    if as_csv:
+        df.to_csv(output, index=False, encoding='utf-8-sig')
+    else:
+        with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
+            df.to_excel(writer, index=False, sheet_name='Sheet1')
+    return output.getvalue()
 
-# 컬럼 인덱스 변환
-def col_letter_to_index(letter):
-    return ord(letter.upper()) - 65
+# 이어할 수 있는 작업이면 "작업 이어하기" 버튼 표시
+def resume_button(job_id, key):
+    job = get_job_store().get(job_id)
+    if not job or job["status"] == "done" or not job["done"]:
+        return False
+    st.info(f"💾 중단된 작업이 있습니다: {job['done']}/{job['total']}행 완료")
+    return st.button("▶️ 작업 이어하기", key=key)
 
 # 탭 구성
-tab1, tab2, tab3, tab4 = st.tabs([
+tab1, tab2, tab3, tab4, tab5 = st.tabs([
     "💬 실시간 문장 번역",
     "🔗 Google Sheets 번역",
     "⚡ 파일 업로드 번역",
-    "📝 프롬프트 생성"
+    "📝 프롬프트 생성",
+    "📋 작업 목록"
 ])
 
 # [Tab 1] 실시간 문장 번역
@@ -336,21 +362,54 @@ with tab1:
         if not input_text.strip():
             st.warning("번역할 문장을 입력해주세요!")
         else:
-            with st.spinner("번역 중..."):
-                translated_text = translate_text(input_text)
+            model = get_model(api_key, master_prompt)
+            queue_wait = {}
             
-            if "Error:" not in translated_text:
+            def interactive_stream():
+                # 배치 작업과 같은 API 키 예산을 쓰지만 interactive 레인으로 먼저 자리를 받음
+                queued = time.perf_counter()
+                with get_scheduler(api_key).slot(INTERACTIVE):
+                    queue_wait["seconds"] = time.perf_counter() - queued
+                    yield from stream_translation(model, input_text)
+            
+            stream, shared = get_stream_coalescer().get_or_start(
+                (normalize_source(input_text), category, level),
+                interactive_stream
+            )
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                st.markdown("**원문:**")
+                st.info(input_text)
+            with col2:
+                st.markdown("**번역:**")
+                st.write_stream(stream.iter())
+            
+            if stream.error is None:
+                translated_text = stream.text.strip()
                 st.success("✅ 번역 완료!")
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.markdown("**원문:**")
-                    st.info(input_text)
-                with col2:
-                    st.markdown("**번역:**")
-                    st.success(translated_text)
+                ttft = stream.time_to_first_token
+                timing = f"⏱️ 첫 토큰 {ttft:.2f}초 · " if ttft is not None else "⏱️ "
+                timing += f"전체 {stream.total_latency:.2f}초"
+                if "seconds" in queue_wait:
+                    timing += f" (대기열 {queue_wait['seconds']:.2f}초 포함)"
+                if shared:
+                    timing += " · 진행 중인 동일 요청 결과를 공유했습니다"
+                st.caption(timing)
                 st.code(translated_text, language="text")
             else:
-                st.error(translated_text)
+                st.error(f"Error: {stream.error}")
+            
+            if use_fuzzy:
+                suggestions = get_fuzzy_memory().near_matches(
+                    input_text, category, level, MODEL_NAME, prompt_version(master_prompt),
+                    threshold=fuzzy_threshold
+                )
+                if suggestions:
+                    with st.expander(f"📚 비슷한 문장의 기존 번역 {len(suggestions)}건"):
+                        for similarity, source, translation in suggestions:
+                            st.caption(f"유사도 {similarity:.0%} · {source}")
+                            st.code(translation, language="text")
 
 # [Tab 2] Google Sheets 번역
 with tab2:
@@ -375,11 +434,168 @@ with tab2:
         help="비워두면 첫 번째 시트를 사용합니다"
     )
     
-    if st.button("🚀 번역 시작", type="primary", key="translate_sheets"):
+    with st.expander("📑 여러 시트 / 여러 컬럼 한 번에 번역"):
+        multi_spec = st.text_area(
+            "작업 명세 (한 줄에 '시트 이름: 원문열->대상열, ...', `*`는 모든 시트)",
+            placeholder="Sheet1: D->E, F->G\n*: B->C",
+            help="입력하면 위의 시트 이름과 사이드바 컬럼 설정 대신 이 명세대로 모든 시트/컬럼을 한 작업으로 번역합니다 (API 인증 필요)"
+        )
+    
+    sheets_job_id = None
+    resume_sheets = False
+    if '/d/' in sheets_url:
+        if multi_spec.strip():
+            sheets_job_id = make_job_id(sheets_url.split('/d/')[1].split('/')[0], multi_spec.strip(), category, level)
+        else:
+            sheets_job_id = make_job_id(
+                sheets_url.split('/d/')[1].split('/')[0], sheet_name,
+                category, level, col_source, col_target
+            )
+        resume_sheets = resume_button(sheets_job_id, "resume_sheets")
+    
+    sheets_background = st.checkbox("🕒 백그라운드로 실행", key="background_sheets",
+                                    help="작업 목록 탭에서 진행 상황을 확인하고 결과를 내려받을 수 있습니다")
+    sheets_chunk_size = st.number_input("💾 시트 저장 단위 (행)", min_value=10, max_value=5000, value=200, step=10,
+                                        help="번역이 끝난 셀을 이 개수만큼 모아서 시트에 바로 저장합니다")
+    
+    if st.button("🧮 예상 비용/시간 계산", key="estimate_sheets"):
+        try:
+            import pandas as pd
+            
+            if '/d/' not in sheets_url:
+                st.error("올바른 Google Sheets URL이 아닙니다")
+            else:
+                sheet_id = sheets_url.split('/d/')[1].split('/')[0]
+                gc = get_google_sheets_client()
+                with st.spinner("원문 읽는 중..."):
+                    if multi_spec.strip() and gc:
+                        cells, _ = gather_cells(gc.open_by_key(sheet_id), parse_job_spec(multi_spec))
+                        source_values = [cell.text for cell in cells]
+                    elif gc:
+                        spreadsheet = gc.open_by_key(sheet_id)
+                        worksheet = spreadsheet.worksheet(sheet_name) if sheet_name else spreadsheet.sheet1
+                        source_values = read_columns(worksheet, [column_index(col_source)])[1][0]
+                    else:
+                        df = pd.read_csv(f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv")
+                        idx_src = column_index(col_source)
+                        source_values = df.iloc[:, idx_src] if idx_src < len(df.columns) else []
+                show_estimate(source_values)
+        except Exception as e:
+            st.error(f"견적을 계산할 수 없습니다: {e}")
+    
+    start_sheets = st.button("🚀 번역 시작", type="primary", key="translate_sheets") or resume_sheets
+    
+    if start_sheets and multi_spec.strip():
+        gc = get_google_sheets_client()
+        if '/d/' not in sheets_url:
+            st.error("올바른 Google Sheets URL이 아닙니다")
+        elif not gc:
+            st.error("여러 시트 번역은 Google Sheets API 인증(gcp_service_account)이 필요합니다")
+        else:
+            try:
+                sheet_id = sheets_url.split('/d/')[1].split('/')[0]
+                tasks = parse_job_spec(multi_spec)
+                with st.spinner("Google Sheets 연결 중..."):
+                    cells, worksheets = gather_cells(gc.open_by_key(sheet_id), tasks)
+                st.success(f"✅ {len(worksheets)}개 시트에서 원문 {len(cells)}셀을 모았습니다 ({describe_tasks(tasks)})")
+                
+                # Delta 모드: 시트/컬럼 쌍마다 원문 해시를 따로 관리
+                delta_store = get_delta_store()
+                doc_keys = {}
+                skipped_cells = 0
+                if delta_mode:
+                    known = {}
+                    changed = []
+                    for cell in cells:
+                        pair = (cell.sheet, cell.source_col, cell.target_col)
+                        if pair not in known:
+                            doc_keys[pair] = make_doc_key("sheets", sheet_id, *pair, category, level)
+                            known[pair] = delta_store.hashes(doc_keys[pair])
+                        if is_unchanged(known[pair], cell.row, cell.text, cell.target_text):
+                            skipped_cells += 1
+                        else:
+                            changed.append(cell)
+                    cells = changed
+                    st.info(f"🔁 Delta 모드: {len(cells)}셀 번역, {skipped_cells}셀 건너뜀 (변경 없음)")
+                
+                def record_cell(cell, translated_text):
+                    if delta_mode and translated_text is not None:
+                        delta_store.record(
+                            doc_keys[(cell.sheet, cell.source_col, cell.target_col)], cell.row, cell.text
+                        )
+                
+                def cells_to_bytes(results):
+                    import pandas as pd
+                    return dataframe_to_bytes(pd.DataFrame([
+                        {"sheet": cell.sheet, "row": cell.row + 2, "target": column_letter(cell.target_col),
+                         "source": cell.text, "translation": results.get(cell_key(cell), "")}
+                        for cell in cells
+                    ]))
+                
+                def translate_all(run_translation, on_cell):
+                    writers = make_writers(worksheets, sheets_chunk_size)
+                    results = translate_cells(
+                        cells,
+                        lambda items, cb: run_translation(
+                            items, cb, job_id=sheets_job_id, job_name=sheets_url, resume=resume_sheets
+                        ),
+                        writers, on_result=on_cell
+                    )
+                    written = sum(writer.written for writer in writers.values())
+                    failed = sum(len(writer.failed) for writer in writers.values())
+                    return results, f"Google Sheets 저장 {written}셀, 실패 {failed}셀"
+                
+                if sheets_background:
+                    runner = get_job_runner()
+                    run_translation, controller, translator = make_translator()
+                    
+                    def multi_sheets_job(job):
+                        def on_job_cell(cell, translated_text, done, total):
+                            record_cell(cell, translated_text)
+                            job.progress(done, total)
+                        
+                        results, write_summary = translate_all(run_translation, on_job_cell)
+                        job.message = f"{describe_run(controller, translator)} · {write_summary}"
+                        job.metrics = translator.metrics.summary(controller)
+                        return "translated_sheets_cells.xlsx", cells_to_bytes(results)
+                    
+                    runner.submit(f"{sheet_id} ({len(worksheets)}개 시트)", multi_sheets_job)
+                    st.success("🕒 백그라운드 작업으로 등록했습니다. '📋 작업 목록' 탭에서 확인하세요.")
+                else:
+                    with st.spinner("번역 중..."):
+                        progress_bar = st.progress(0)
+                        preview_container = st.empty()
+                        
+                        def on_cell(cell, translated_text, done, total):
+                            record_cell(cell, translated_text)
+                            progress_bar.progress(done / total)
+                            preview_container.text(f"Processing cell {done}/{total} ({cell.sheet} row {cell.row + 2})")
+                        
+                        run_translation, controller, translator = make_translator()
+                        results, write_summary = translate_all(run_translation, on_cell)
+                        progress_bar.progress(1.0)
+                    
+                    st.success(f"🎉 번역 완료! {len(worksheets)}개 시트 · {write_summary}")
+                    cells_by_key = {cell_key(cell): cell for cell in cells}
+                    show_run_report(controller, translator, "multi_sheets",
+                                    row_label=lambda key: describe_cell(cells_by_key[key]))
+                    st.markdown(f"[📊 결과 확인하기]({sheets_url})")
+                    st.download_button(
+                        label="📥 번역 결과 다운로드 (Excel)",
+                        data=cells_to_bytes(results),
+                        file_name="translated_sheets_cells.xlsx",
+                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                    )
+            except Exception as e:
+                st.error(f"오류가 발생했습니다: {e}")
+    
+    elif start_sheets:
         if not sheets_url:
             st.warning("Google Sheets URL을 입력해주세요!")
         else:
             try:
+                import pandas as pd
+                
                 with st.spinner("Google Sheets 연결 중..."):
                     if '/d/' in sheets_url:
                         sheet_id = sheets_url.split('/d/')[1].split('/')[0]
@@ -387,6 +603,9 @@ with tab2:
                         st.error("올바른 Google Sheets URL이 아닙니다")
                         st.stop()
                     
+                    idx_src = column_index(col_source)
+                    idx_tgt = column_index(col_target)
+                    
                     gc = get_google_sheets_client()
                     if not gc:
                         st.warning("⚠️ Google Sheets API 인증이 설정되지 않았습니다. 공개 시트만 읽을 수 있습니다.")
@@ -398,6 +617,12 @@ with tab2:
                             st.error(f"시트를 읽을 수 없습니다: {e}")
                             st.info("시트가 '누구나 링크가 있는 사용자'에게 공개되어 있는지 확인하세요")
                             st.stop()
+                        
+                        df_idx_src, df_idx_tgt = idx_src, idx_tgt
+                        # 공개 시트가 대상 컬럼보다 좁으면 끝에 새 컬럼을 붙이고 그 위치에 결과를 씀
+                        if len(df.columns) <= idx_tgt:
+                            df[f'Column_{col_target}'] = ""
+                            df_idx_tgt = len(df.columns) - 1
                     else:
                         spreadsheet = gc.open_by_key(sheet_id)
                         if sheet_name:
@@ -405,81 +630,98 @@ with tab2:
                         else:
                             worksheet = spreadsheet.sheet1
                         
-                        data = worksheet.get_all_values()
-                        df = pd.DataFrame(data[1:], columns=data[0])
+                        # 원문/대상 컬럼만 범위로 읽기
+                        headers, columns = read_columns(worksheet, [idx_src, idx_tgt])
+                        df = pd.DataFrame(list(zip(*columns)), columns=headers)
+                        df_idx_src, df_idx_tgt = 0, 1
                         can_write = True
                     
                     st.success(f"✅ 시트 로드 완료! (총 {len(df)}행)")
                     st.dataframe(df.head(), use_container_width=True)
                 
-                with st.spinner("번역 중..."):
-                    idx_src = col_letter_to_index(col_source)
-                    idx_tgt = col_letter_to_index(col_target)
-                    
-                    if len(df.columns) <= idx_tgt:
-                        df[f'Column_{col_target}'] = ""
-                    
-                    progress_bar = st.progress(0)
-                    total_rows = len(df)
-                    preview_container = st.empty()
+                items = collect_items(df, df_idx_src)
+                total_rows = len(df)
+                
+                sheets_doc_key = make_doc_key("sheets", sheet_id, sheet_name, col_source, col_target, category, level)
+                items, skipped_rows, record_delta = prepare_delta(items, df, df_idx_tgt, sheets_doc_key)
+                if delta_mode:
+                    st.info(f"🔁 Delta 모드: {len(items)}행 번역, {skipped_rows}행 건너뜀 (변경 없음)")
+                
+                def make_sheet_writer():
+                    if not (can_write and gc):
+                        return None
+                    return ChunkedSheetWriter(worksheet, idx_tgt, chunk_size=sheets_chunk_size)
+                
+                def apply_result(sheet_writer, index, translated_text):
+                    if translated_text is None:
+                        return
+                    df.iat[index, df_idx_tgt] = translated_text
+                    record_delta(index, translated_text)
+                    if sheet_writer:
+                        sheet_writer.add(index, translated_text)
+                
+                if sheets_background:
+                    runner = get_job_runner()
+                    run_translation, controller, translator = make_translator()
                     
-                    translations = []
+                    def sheets_job(job):
+                        sheet_writer = make_sheet_writer()
+                        
+                        def on_job_result(index, translated_text, done, total):
+                            apply_result(sheet_writer, index, translated_text)
+                            job.progress(done, total)
+                        
+                        run_translation(
+                            items, on_job_result,
+                            job_id=sheets_job_id, job_name=sheets_url, resume=resume_sheets
+                        )
+                        job.message = describe_run(controller, translator)
+                        job.metrics = translator.metrics.summary(controller)
+                        if sheet_writer:
+                            sheet_writer.close()
+                            job.message += f" · Google Sheets 저장 {sheet_writer.written}셀, 실패 {len(sheet_writer.failed)}셀"
+                        return "translated_sheets_result.xlsx", dataframe_to_bytes(df)
                     
-                    for index, row in df.iterrows():
-                        if idx_src < len(row):
-                            source_text = str(row.iloc[idx_src]) if pd.notna(row.iloc[idx_src]) else ""
-                        else:
-                            source_text = ""
+                    runner.submit(sheet_name or sheet_id, sheets_job)
+                    st.success("🕒 백그라운드 작업으로 등록했습니다. '📋 작업 목록' 탭에서 확인하세요.")
+                else:
+                    with st.spinner("번역 중..."):
+                        progress_bar = st.progress(0)
+                        preview_container = st.empty()
+                        sheet_writer = make_sheet_writer()
                         
-                        if source_text.strip():
-                            translated_text = translate_text(source_text)
-                            translations.append(translated_text)
-                        else:
-                            translations.append("")
+                        def on_result(index, translated_text, done, total):
+                            apply_result(sheet_writer, index, translated_text)
+                            progress_bar.progress(done / total)
+                            preview_container.text(f"Processing row {done}/{total} (row {index+1})")
                         
-                        if idx_tgt < len(df.columns):
-                            df.iat[index, idx_tgt] = translated_text
+                        run_translation, controller, translator = make_translator()
+                        run_translation(
+                            items, on_result,
+                            job_id=sheets_job_id, job_name=sheets_url, resume=resume_sheets
+                        )
+                        progress_bar.progress(1.0)
                         
-                        progress = (index + 1) / total_rows
-                        progress_bar.progress(progress)
-                        preview_container.text(f"Processing row {index+1}/{total_rows}")
+                        st.success("🎉 번역 완료!")
+                        show_run_report(controller, translator, "sheets")
                         
-                        time.sleep(0.5)
-                    
-                    st.success("🎉 번역 완료!")
-                    
-                    if can_write and gc:
-                        try:
+                        if sheet_writer:
                             with st.spinner("Google Sheets에 저장 중..."):
-                                target_col_num = idx_tgt + 1
-                                start_row = 2
-                                
-                                cell_list = []
-                                for i, translation in enumerate(translations):
-                                    cell_list.append(gspread.Cell(
-                                        row=start_row + i,
-                                        col=target_col_num,
-                                        value=translation
-                                    ))
-                                
-                                worksheet.update_cells(cell_list)
+                                sheet_writer.close()
                             
-                            st.success("✅ Google Sheets 업데이트 완료!")
-                            st.markdown(f"[📊 결과 확인하기]({sheets_url})")
-                        except Exception as e:
-                            st.warning(f"Google Sheets 저장 실패: {e}")
-                            st.info("엑셀 파일로 다운로드하세요")
-                    
-                    output = BytesIO()
-                    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-                        df.to_excel(writer, index=False, sheet_name='Sheet1')
-                    
-                    st.download_button(
-                        label="📥 번역 결과 다운로드 (Excel)",
-                        data=output.getvalue(),
-                        file_name="translated_sheets_result.xlsx",
-                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                    )
+                            if not sheet_writer.failed:
+                                st.success(f"✅ Google Sheets 업데이트 완료! ({sheet_writer.written}셀)")
+                                st.markdown(f"[📊 결과 확인하기]({sheets_url})")
+                            else:
+                                st.warning(f"Google Sheets 저장 실패: {len(sheet_writer.failed)}셀")
+                                st.info("엑셀 파일로 다운로드하세요")
+                        
+                        st.download_button(
+                            label="📥 번역 결과 다운로드 (Excel)",
+                            data=dataframe_to_bytes(df),
+                            file_name="translated_sheets_result.xlsx",
+                            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                        )
                 
             except Exception as e:
                 st.error(f"오류가 발생했습니다: {e}")
@@ -500,57 +742,202 @@ with tab3:
     if uploaded_file:
         st.success("✅ 파일이 업로드되었습니다!")
         
-        if st.button("🚀 번역 시작", type="primary", key="translate_file"):
+        file_background = st.checkbox("🕒 백그라운드로 실행", key="background_file",
+                                      help="작업 목록 탭에서 진행 상황을 확인하고 결과를 내려받을 수 있습니다")
+        file_streaming = st.checkbox("📦 대용량 스트리밍 모드", key="streaming_file",
+                                     help="원문을 청크 단위로 읽고 결과를 바로 파일에 기록해 메모리 사용량을 일정하게 유지합니다")
+        
+        # pandas는 빈 줄을 건너뛰고 스트리밍 리더는 세므로 두 모드의 행 번호가 다르다.
+        # 체크포인트와 Delta 해시가 다른 모드의 행에 섞이지 않도록 스트리밍 모드는 키를 따로 쓴다
+        file_mode = ("stream",) if file_streaming else ()
+        # 위젯을 바꿀 때마다 큰 업로드 전체를 복사/해시하지 않도록 업로드마다 한 번만 계산
+        fingerprint_key = f"file_fingerprint_{uploaded_file.file_id}"
+        if fingerprint_key not in st.session_state:
+            st.session_state[fingerprint_key] = file_fingerprint(uploaded_file.getbuffer())
+        file_job_id = make_job_id(
+            st.session_state[fingerprint_key],
+            category, level, col_source, col_target, *file_mode
+        )
+        file_doc_key = make_doc_key("file", uploaded_file.name, col_source, col_target, category, level, *file_mode)
+        resume_file = resume_button(file_job_id, "resume_file")
+        
+        if st.button("🧮 예상 비용/시간 계산", key="estimate_file"):
             try:
+                import pandas as pd
+                
+                if uploaded_file.name.endswith('.csv'):
+                    df = pd.read_csv(uploaded_file, usecols=[column_index(col_source)])
+                else:
+                    df = pd.read_excel(uploaded_file, usecols=[column_index(col_source)])
+                uploaded_file.seek(0)
+                show_estimate(df.iloc[:, 0])
+            except Exception as e:
+                st.error(f"견적을 계산할 수 없습니다: {e}")
+        
+        start_file = st.button("🚀 번역 시작", type="primary", key="translate_file") or resume_file
+        
+        if start_file and file_streaming:
+            try:
+                as_csv = uploaded_file.name.endswith('.csv')
+                file_name = "translated_result.csv" if as_csv else "translated_result.xlsx"
+                idx_src = column_index(col_source)
+                idx_tgt = column_index(col_target)
+                
+                with tempfile.NamedTemporaryFile(delete=False, suffix=".csv" if as_csv else ".xlsx") as tmp:
+                    tmp.write(uploaded_file.getbuffer())
+                    upload_path = tmp.name
+                
+                runner = get_job_runner() if file_background else None
+                run_translation, controller, translator = make_translator()
+                if not resume_file:
+                    get_job_store().start(file_job_id, uploaded_file.name, 0)
+                
+                delta_store = get_delta_store()
+                known_hashes = delta_store.hashes(file_doc_key) if delta_mode else {}
+                delta_counts = {"sent": 0, "skipped": 0}
+                
+                def translate_file(on_progress):
+                    def skip_row(index, source_text, target_text):
+                        if is_unchanged(known_hashes, index, source_text, target_text):
+                            delta_counts["skipped"] += 1
+                            return True
+                        return False
+                    
+                    def translate_chunk(chunk_items):
+                        delta_counts["sent"] += len(chunk_items)
+                        results = run_translation(
+                            chunk_items, None,
+                            job_id=file_job_id, job_name=uploaded_file.name, resume=True,
+                            total=delta_counts["sent"], finish=False
+                        )
+                        for index, text in chunk_items:
+                            if index in results:
+                                delta_store.record(file_doc_key, index, text)
+                        return results
+                    
+                    try:
+                        out_path = stream_translate_file(
+                            upload_path, as_csv, idx_src, idx_tgt, f'Column {col_target}',
+                            translate_chunk, on_progress=on_progress,
+                            skip_row=skip_row if delta_mode else None
+                        )
+                    finally:
+                        os.remove(upload_path)
+                    # 청크마다가 아니라 파일 전체가 끝난 뒤 한 번만 완료/부분 완료로 기록
+                    get_job_store().finish(file_job_id, status="partial" if controller.failures else "done")
+                    return out_path
+                
+                if file_background:
+                    def file_job(job):
+                        total_rows = count_rows(upload_path, as_csv)
+                        out_path = translate_file(lambda rows_done: job.progress(rows_done, max(total_rows, rows_done)))
+                        job.message = describe_run(controller, translator)
+                        job.metrics = translator.metrics.summary(controller)
+                        if delta_mode:
+                            job.message += f" · Delta 모드: {delta_counts['sent']}행 번역, {delta_counts['skipped']}행 건너뜀"
+                        return file_name, out_path
+                    
+                    runner.submit(uploaded_file.name, file_job)
+                    st.success("🕒 백그라운드 작업으로 등록했습니다. '📋 작업 목록' 탭에서 확인하세요.")
+                else:
+                    preview_container = st.empty()
+                    with st.spinner("번역 중..."):
+                        out_path = translate_file(
+                            lambda rows_done: preview_container.text(f"Processing row {rows_done}")
+                        )
+                    
+                    st.success("🎉 번역 완료! 아래 버튼을 눌러 다운로드하세요.")
+                    show_run_report(controller, translator, "file_streaming")
+                    if delta_mode:
+                        st.info(f"🔁 Delta 모드: {delta_counts['sent']}행 번역, {delta_counts['skipped']}행 건너뜀 (변경 없음)")
+                    
+                    with open(out_path, "rb") as f:
+                        st.download_button(
+                            label="📥 번역된 파일 다운로드",
+                            data=f,
+                            file_name=file_name,
+                            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                        )
+                    os.remove(out_path)
+            
+            except Exception as e:
+                st.error(f"오류가 발생했습니다: {e}")
+                st.warning("팁: D열, E열이 실제로 존재하는지 확인해주세요.")
+        
+        elif start_file:
+            try:
+                import pandas as pd
+                
                 if uploaded_file.name.endswith('.csv'):
                     df = pd.read_csv(uploaded_file)
                 else:
                     df = pd.read_excel(uploaded_file)
                 
-                idx_src = col_letter_to_index(col_source)
-                idx_tgt = col_letter_to_index(col_target)
+                idx_src = column_index(col_source)
+                idx_tgt = column_index(col_target)
                 
                 if len(df.columns) <= idx_tgt:
                     df[f'Column {col_target}'] = ""
                     idx_tgt = len(df.columns) - 1
                 
-                progress_bar = st.progress(0)
-                total_rows = len(df)
-                preview_container = st.empty()
+                items = collect_items(df, idx_src)
+                items, skipped_rows, record_delta = prepare_delta(items, df, idx_tgt, file_doc_key)
+                if delta_mode:
+                    st.info(f"🔁 Delta 모드: {len(items)}행 번역, {skipped_rows}행 건너뜀 (변경 없음)")
+                as_csv = uploaded_file.name.endswith('.csv')
+                file_name = "translated_result.csv" if as_csv else "translated_result.xlsx"
                 
-                for index, row in df.iterrows():
-                    source_text = str(row.iloc[idx_src]) if pd.notna(row.iloc[idx_src]) else ""
+                if file_background:
+                    runner = get_job_runner()
+                    run_translation, controller, translator = make_translator()
                     
-                    if source_text.strip():
-                        translated_text = translate_text(source_text)
-                    else:
-                        translated_text = ""
+                    def file_job(job):
+                        def on_job_result(index, translated_text, done, total):
+                            if translated_text is not None:
+                                df.iat[index, idx_tgt] = translated_text
+                                record_delta(index, translated_text)
+                            job.progress(done, total)
+                        
+                        run_translation(
+                            items, on_job_result,
+                            job_id=file_job_id, job_name=uploaded_file.name, resume=resume_file
+                        )
+                        job.message = describe_run(controller, translator)
+                        job.metrics = translator.metrics.summary(controller)
+                        return file_name, dataframe_to_bytes(df, as_csv)
+                    
+                    runner.submit(uploaded_file.name, file_job)
+                    st.success("🕒 백그라운드 작업으로 등록했습니다. '📋 작업 목록' 탭에서 확인하세요.")
+                else:
+                    progress_bar = st.progress(0)
+                    preview_container = st.empty()
                     
-                    df.iat[index, idx_tgt] = translated_text
+                    def on_result(index, translated_text, done, total):
+                        progress_bar.progress(done / total)
+                        source_text = str(df.iat[index, idx_src])
+                        if translated_text is None:
+                            preview_container.text(f"Processing row {done}/{total}: {source_text[:30]}... → (실패)")
+                            return
+                        df.iat[index, idx_tgt] = translated_text
+                        record_delta(index, translated_text)
+                        preview_container.text(f"Processing row {done}/{total}: {source_text[:30]}... → {translated_text[:30]}...")
                     
-                    progress = (index + 1) / total_rows
-                    progress_bar.progress(progress)
-                    preview_container.text(f"Processing row {index+1}/{total_rows}: {source_text[:30]}... → {translated_text[:30]}...")
+                    run_translation, controller, translator = make_translator()
+                    run_translation(
+                        items, on_result,
+                        job_id=file_job_id, job_name=uploaded_file.name, resume=resume_file
+                    )
+                    progress_bar.progress(1.0)
                     
-                    time.sleep(0.5)
-                
-                st.success("🎉 번역 완료! 아래 버튼을 눌러 다운로드하세요.")
-                
-                output = BytesIO()
-                if uploaded_file.name.endswith('.csv'):
-                    df.to_csv(output, index=False, encoding='utf-8-sig')
-                    file_name = "translated_result.csv"
-                else:
-                    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-                        df.to_excel(writer, index=False, sheet_name='Sheet1')
-                    file_name = "translated_result.xlsx"
-                
-                st.download_button(
-                    label="📥 번역된 파일 다운로드",
-                    data=output.getvalue(),
-                    file_name=file_name,
-                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                )
+                    st.success("🎉 번역 완료! 아래 버튼을 눌러 다운로드하세요.")
+                    show_run_report(controller, translator, "file")
+                    
+                    st.download_button(
+                        label="📥 번역된 파일 다운로드",
+                        data=dataframe_to_bytes(df, as_csv),
+                        file_name=file_name,
+                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                    )
                 
             except Exception as e:
                 st.error(f"오류가 발생했습니다: {e}")
@@ -571,3 +958,75 @@ with tab4:
 3. Put the result in **Column {col_target}** (Korean).
 """
     st.code(display_prompt, language='text')
+
+# [Tab 5] 작업 목록
+with tab5:
+    st.subheader("📋 백그라운드 작업 목록")
+    st.info("여러 작업이 같은 API 예산(RPM)을 나눠 씁니다. 완료된 결과는 여기서 언제든 내려받을 수 있습니다.")
+    
+    # 대기 중이거나 실행 중인 작업이 있을 때만 2초마다 갱신
+    jobs_active = get_job_runner().has_active()
+    
+    @st.fragment(run_every=2 if jobs_active else None)
+    def render_jobs():
+        runner = get_job_runner()
+        if not jobs_active:
+            st.button("🔄 새로고침", key="refresh_jobs")
+        lanes = get_scheduler(api_key).snapshot()
+        lane_cols = st.columns(len(lanes))
+        for col, (lane, stats) in zip(lane_cols, lanes.items()):
+            label = "⚡ 실시간" if lane == INTERACTIVE else "📦 배치"
+            wait = "-" if stats["wait_avg"] is None else f"{stats['wait_avg']:.2f}s / p95 {stats['wait_p95']:.2f}s"
+            col.metric(f"{label} 대기 {stats['waiting']} · 실행 {stats['in_flight']}", wait)
+        
+        jobs = runner.jobs()
+        if not jobs:
+            st.caption("등록된 작업이 없습니다.")
+            return
+        
+        for job in jobs:
+            with st.container(border=True):
+                st.markdown(f"**{job.name}** · `{job.job_id}` · {job.status}")
+                if job.total:
+                    st.progress(job.done / job.total)
+                eta = f"{job.eta:.0f}초" if job.eta is not None else "-"
+                st.caption(f"{job.done}/{job.total}행 · {job.throughput:.2f} rows/s · 남은 시간 {eta}")
+                if job.message:
+                    st.caption(job.message)
+                if job.metrics:
+                    show_metrics(job.metrics, job.job_id)
+                if job.error:
+                    st.error(job.error)
+                if job.status == "done" and job.artifact_path:
+                    # 결과 파일은 요청했을 때 한 번만 읽고, 내려받으면 세션에서 비움
+                    download_key = f"artifact_{job.job_id}"
+                    if download_key not in st.session_state:
+                        if st.button(f"📦 {job.artifact_name} 다운로드 준비", key=f"prepare_{job.job_id}"):
+                            st.session_state[download_key] = job.read_artifact()
+                    if st.session_state.get(download_key) is not None:
+                        st.download_button(
+                            label=f"📥 {job.artifact_name}",
+                            data=st.session_state[download_key],
+                            file_name=job.artifact_name,
+                            key=f"download_{job.job_id}",
+                            on_click=st.session_state.pop, args=(download_key, None)
+                        )
+        
+        # 마지막 작업이 끝났거나(자동 갱신 멈춤) 새 작업이 생기면(자동 갱신 시작) 전체를 다시 실행
+        if runner.has_active() != jobs_active:
+            st.rerun()
+    
+    render_jobs()
+
+# 실행 시간 기록: 프로세스의 첫 실행은 모듈 import를 포함한 콜드 스타트, 이후는 재실행
+run_seconds = time.perf_counter() - _run_started
+run_timings = get_run_timings()
+if run_timings["cold_start"] is None:
+    run_timings["cold_start"] = run_seconds
+else:
+    run_timings["reruns"].append(run_seconds)
+with st.sidebar:
+    st.divider()
+    reruns = sorted(run_timings["reruns"])
+    rerun_text = f"재실행 {run_seconds:.2f}초 (중앙값 {percentile(reruns, 50):.2f}초, {len(reruns)}회)" if reruns else "재실행 기록 없음"
+    st.caption(f"⏱️ 콜드 스타트 {run_timings['cold_start']:.2f}초 · {rerun_text}")
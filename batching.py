@@ -0,0 +1,138 @@
+"""여러 행을 한 번의 Gemini 호출로 번역하는 배치 모드.
+
+각 행에 id를 붙여 JSON으로 보내고, 모델은 {"id": "번역"} 형태의 JSON을 돌려준다.
+배치는 토큰 예산 기준으로 나누며, 응답이 깨지거나 개수가 맞지 않으면 반으로 쪼개서 다시 보낸다.
+"""
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from engine import RateLimiter
+from rate_control import PERMANENT, AdaptiveController, TranslationFailed
+
+BATCH_INSTRUCTION = """
+[Batch Instruction]
+- The input is a JSON array of objects with "id" and "text".
+- Translate every "text" following all rules above.
+- Respond with ONLY a JSON object mapping each "id" (as a string) to its Korean translation.
+- Return exactly one entry per input id. Do not merge or skip rows.
+"""
+
+_JSON_BLOCK = re.compile(r"\{.*\}", re.DOTALL)
+
+
+# 로컬 토큰 근사치 (영문 약 4자당 1토큰, 한글/기타 문자는 1자당 1토큰)
+def estimate_tokens(text):
+    text = str(text)
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return ascii_chars // 4 + (len(text) - ascii_chars) + 1
+
+
+def make_batches(items, token_budget=2000, max_rows=50):
+    """(index, text) 목록을 토큰 예산과 최대 행 수에 맞춰 배치로 나눈다."""
+    batches = []
+    current = []
+    current_tokens = 0
+    for index, text in items:
+        tokens = estimate_tokens(text) + 8
+        if current and (current_tokens + tokens > token_budget or len(current) >= max_rows):
+            batches.append(current)
+            current = []
+            current_tokens = 0
+        current.append((index, text))
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+def build_batch_prompt(batch):
+    rows = [{"id": str(index), "text": text} for index, text in batch]
+    return f"{BATCH_INSTRUCTION}\n[Source Rows]:\n{json.dumps(rows, ensure_ascii=False)}\n[Translations]:"
+
+
+def parse_batch_response(raw, ids):
+    """모델 응답을 {index: 번역}으로 변환한다. 형식이 틀리거나 id가 맞지 않으면 ValueError."""
+    match = _JSON_BLOCK.search(raw or "")
+    if not match:
+        raise ValueError("batch response is not JSON")
+    data = json.loads(match.group(0))
+    if not isinstance(data, dict):
+        raise ValueError("batch response is not a JSON object")
+
+    expected = {str(index) for index in ids}
+    if set(data) != expected:
+        raise ValueError(f"batch response has {len(data)} ids, expected {len(expected)}")
+
+    return {index: str(data[str(index)]).strip() for index in ids}
+
+
+def translate_rows_batched(items, batch_fn, translate_fn, token_budget=2000, max_rows=50,
+                           max_workers=4, rpm=60, on_result=None, limiter=None,
+                           controller=None, attempts=3, retry_attempts=5):
+    """배치 단위로 병렬 번역해서 {index: 번역}을 반환한다.
+
+    batch_fn(prompt)은 모델의 원시 응답 문자열을, translate_fn(text)는 단일 행 번역을 반환한다.
+    on_result(index, translated, done, total)는 호출한 스레드에서 행마다 실행된다.
+    할당량 초과/일시 오류로 실패한 배치는 마지막에 다시 보내고, 끝내 실패한 행은 translated=None으로 알린다.
+    """
+    items = list(items)
+    total = len(items)
+    results = {}
+    if not total:
+        return results
+
+    controller = controller or AdaptiveController(max_workers, limiter or RateLimiter(rpm))
+    done = 0
+
+    def run_single(text, tries):
+        try:
+            return controller.call(translate_fn, text, attempts=tries)
+        except TranslationFailed as failure:
+            return failure
+
+    def run_batch(batch, tries):
+        if len(batch) == 1:
+            index, text = batch[0]
+            return {index: run_single(text, tries)}
+
+        try:
+            raw = controller.call(batch_fn, build_batch_prompt(batch), attempts=tries)
+            return parse_batch_response(raw, [index for index, _ in batch])
+        except TranslationFailed as failure:
+            if failure.kind != PERMANENT:
+                return {index: failure for index, _ in batch}
+        except ValueError:
+            pass
+        # 응답이 깨졌거나 개수가 맞지 않으면 반으로 나눠 재시도
+        middle = len(batch) // 2
+        merged = run_batch(batch[:middle], tries)
+        merged.update(run_batch(batch[middle:], tries))
+        return merged
+
+    def run_pass(batch_items, tries, retry_queue=None):
+        nonlocal done
+        texts = dict(batch_items)
+        batches = make_batches(batch_items, token_budget=token_budget, max_rows=max_rows)
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = [executor.submit(run_batch, batch, tries) for batch in batches]
+            for future in as_completed(futures):
+                for index, translated in future.result().items():
+                    if isinstance(translated, TranslationFailed):
+                        if retry_queue is not None and translated.kind != PERMANENT:
+                            retry_queue.append((index, texts[index]))
+                            continue
+                        controller.record_failure(index, translated)
+                        translated = None
+                    else:
+                        results[index] = translated
+                    done += 1
+                    if on_result:
+                        on_result(index, translated, done, total)
+
+    retry_queue = []
+    run_pass(items, attempts, retry_queue)
+    if retry_queue:
+        run_pass(sorted(retry_queue), retry_attempts)
+
+    return results
@@ -0,0 +1,62 @@
+"""모델 재사용 마이크로벤치마크.
+
+기존 방식(행마다 configure + GenerativeModel 생성 + master_prompt 인라인)과
+캐시된 모델 + system_instruction 방식의 호출당 오버헤드를 가짜 백엔드로 비교한다.
+
+    python benchmarks/bench_client.py --rows 500
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import gemini_client  # noqa: E402
+from fake_backend import FakeGenAI  # noqa: E402
+
+SYSTEM_PROMPT = "You are Uphone's Localization Specialist.\n" + ("- rule line for the benchmark prompt\n" * 120)
+
+
+def run_legacy(backend, rows):
+    for text in rows:
+        backend.configure(api_key="bench")
+        model = backend.GenerativeModel(gemini_client.MODEL_NAME)
+        model.generate_content(f"{SYSTEM_PROMPT}\n\n[Source Text]: {text}\n[Translation]:")
+
+
+def run_cached(backend, rows):
+    gemini_client.clear_models()
+    for text in rows:
+        model = gemini_client.get_model("bench", SYSTEM_PROMPT, genai_module=backend)
+        gemini_client.generate_translation(model, text)
+
+
+def measure(name, runner, rows, args):
+    backend = FakeGenAI(configure_cost=args.configure_cost, model_init_cost=args.model_init_cost)
+    started = time.perf_counter()
+    runner(backend, rows)
+    elapsed = time.perf_counter() - started
+    per_call_us = elapsed / len(rows) * 1e6
+    print(f"{name:8s} calls={backend.calls:6d} time={elapsed:8.3f}s "
+          f"per_call={per_call_us:9.1f}us content_chars/call={backend.content_chars / backend.calls:8.1f}")
+    return per_call_us
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--configure-cost", type=float, default=0.0005,
+                        help="가짜 configure() 호출 비용(초)")
+    parser.add_argument("--model-init-cost", type=float, default=0.0005,
+                        help="가짜 GenerativeModel 생성 비용(초)")
+    args = parser.parse_args()
+
+    rows = [f"Sample sentence number {i}." for i in range(args.rows)]
+    legacy = measure("legacy", run_legacy, rows, args)
+    cached = measure("cached", run_cached, rows, args)
+    print(f"saved per call: {legacy - cached:.1f}us ({(1 - cached / legacy):.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""유사 문장 색인의 조회 속도 측정.
+
+임의 문장 N개를 FuzzyMemory에 넣은 뒤 템플릿 조회(get)와 근사 일치 조회(near_matches)의
+평균 지연 시간을 출력한다. 색인 크기가 커져도 조회 시간이 거의 늘지 않는지 확인하는 용도이다.
+
+    python benchmarks/bench_fuzzy_memory.py --entries 100000 --queries 500
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fuzzy_memory import FuzzyMemory  # noqa: E402
+
+WORDS = ("message account payment order delivery update profile friend photo event ticket reward "
+         "level coin item store notice setting password email review").split()
+SCOPE = ("News", "Advanced", "model", "prompt")
+
+
+def make_sentence(rng):
+    words = rng.sample(WORDS, 6)
+    return f"Your {words[0]} {words[1]} has {rng.randint(1, 999)} new {words[2]} for {words[3]} {words[4]} {words[5]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=500)
+    args = parser.parse_args()
+
+    rng = random.Random(3)
+    with tempfile.TemporaryDirectory() as directory:
+        memory = FuzzyMemory(os.path.join(directory, "fuzzy.sqlite3"), max_entries=args.entries * 2)
+        sentences = [make_sentence(rng) for _ in range(args.entries)]
+        started = time.perf_counter()
+        for sentence in sentences:
+            memory.put(sentence, *SCOPE, f"[KO] {sentence}")
+        insert_seconds = time.perf_counter() - started
+
+        queries = [rng.choice(sentences) for _ in range(args.queries)]
+        started = time.perf_counter()
+        template_hits = sum(memory.get(query.replace("has ", "has 1"), *SCOPE) is not None for query in queries)
+        get_ms = (time.perf_counter() - started) * 1000 / args.queries
+
+        started = time.perf_counter()
+        near_hits = sum(bool(memory.near_matches(query.replace("Your", "The"), *SCOPE)) for query in queries)
+        near_ms = (time.perf_counter() - started) * 1000 / args.queries
+
+    print(f"entries={len(sentences):,} insert={insert_seconds:.1f}s ({args.entries / insert_seconds:,.0f}/s)")
+    print(f"template get  {get_ms:6.2f} ms/query  hits={template_hits}/{args.queries}")
+    print(f"near_matches  {near_ms:6.2f} ms/query  hits={near_hits}/{args.queries}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Google Sheets 입출력 비교 (가짜 워크시트).
+
+기존 방식(get_all_values + 마지막에 한 번에 저장)과 범위 읽기 + 청크 저장 방식의
+읽은 셀 수, 쓰기 호출 수, 실패 주입 시 저장된 셀 수를 비교한다.
+
+    python benchmarks/bench_sheets_io.py --rows 5000 --cols 30 --fail-writes 2
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_backend import FakeWorksheet, fake_translate  # noqa: E402
+from sheets_io import ChunkedSheetWriter, column_letter, read_columns  # noqa: E402
+
+IDX_SRC = 3
+IDX_TGT = 4
+
+
+def make_sheet(rows, cols, fail_writes):
+    header = [f"col{c}" for c in range(cols)]
+    data = [[f"r{r}c{c}" for c in range(cols)] for r in range(rows)]
+    for row in data:
+        row[IDX_TGT] = ""
+    return FakeWorksheet([header] + data, fail_writes=fail_writes)
+
+
+def run_legacy(worksheet):
+    data = worksheet.get_all_values()
+    translations = [fake_translate(row[IDX_SRC]) for row in data[1:]]
+    letter = column_letter(IDX_TGT)
+    try:
+        worksheet.batch_update([{
+            "range": f"{letter}2:{letter}{len(translations) + 1}",
+            "values": [[value] for value in translations],
+        }])
+    except Exception:
+        pass
+
+
+def run_chunked(worksheet, chunk_size):
+    _, columns = read_columns(worksheet, [IDX_SRC, IDX_TGT])
+    writer = ChunkedSheetWriter(worksheet, IDX_TGT, chunk_size=chunk_size, backoff=0)
+    for index, source in enumerate(columns[0]):
+        writer.add(index, fake_translate(source))
+    writer.close()
+
+
+def report(name, worksheet, elapsed):
+    saved = sum(1 for row in worksheet.rows[1:] if row[IDX_TGT])
+    print(f"{name:8s} time={elapsed:6.3f}s cells_read={worksheet.cells_read:8d} "
+          f"write_calls={worksheet.write_calls:4d} cells_saved={saved:6d}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--cols", type=int, default=30)
+    parser.add_argument("--chunk-size", type=int, default=200)
+    parser.add_argument("--fail-writes", type=int, default=1,
+                        help="처음 N번의 쓰기 호출을 실패시킨다")
+    args = parser.parse_args()
+
+    worksheet = make_sheet(args.rows, args.cols, args.fail_writes)
+    started = time.perf_counter()
+    run_legacy(worksheet)
+    report("legacy", worksheet, time.perf_counter() - started)
+
+    worksheet = make_sheet(args.rows, args.cols, args.fail_writes)
+    started = time.perf_counter()
+    run_chunked(worksheet, args.chunk_size)
+    report("chunked", worksheet, time.perf_counter() - started)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""대용량 파일 입출력 메모리 벤치마크.
+
+기존 Tab 3 방식(pandas 전체 로드 + df.iat + BytesIO 출력)과 스트리밍 방식의 최대 메모리를 비교한다.
+모드마다 별도 프로세스에서 실행하고 tracemalloc 최대값과 최대 RSS를 출력한다.
+
+    python benchmarks/bench_streaming_io.py --rows 200000 --format csv
+    python benchmarks/bench_streaming_io.py --rows 200000 --format xlsx
+"""
+import argparse
+import csv
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+IDX_SRC = 3
+IDX_TGT = 4
+
+
+def fake_translate(text):
+    return f"[KO] {text}"
+
+
+def make_input(path, rows, is_csv):
+    header = ["A", "B", "C", "English", "Korean"]
+
+    def row(i):
+        return [i, f"id-{i}", "dialogue", f"Sample sentence number {i} for the benchmark.", ""]
+
+    if is_csv:
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            for i in range(rows):
+                writer.writerow(row(i))
+    else:
+        import xlsxwriter
+
+        workbook = xlsxwriter.Workbook(path, {"constant_memory": True})
+        worksheet = workbook.add_worksheet("Sheet1")
+        worksheet.write_row(0, 0, header)
+        for i in range(rows):
+            worksheet.write_row(i + 1, 0, row(i))
+        workbook.close()
+
+
+def run_legacy(path, is_csv):
+    from io import BytesIO
+
+    import pandas as pd
+
+    df = pd.read_csv(path) if is_csv else pd.read_excel(path)
+    df[df.columns[IDX_TGT]] = df[df.columns[IDX_TGT]].astype(object)
+    for index in range(len(df)):
+        value = df.iat[index, IDX_SRC]
+        if pd.notna(value) and str(value).strip():
+            df.iat[index, IDX_TGT] = fake_translate(str(value))
+    output = BytesIO()
+    if is_csv:
+        df.to_csv(output, index=False, encoding="utf-8-sig")
+    else:
+        with pd.ExcelWriter(output, engine="xlsxwriter") as writer:
+            df.to_excel(writer, index=False, sheet_name="Sheet1")
+    return len(output.getvalue())
+
+
+def run_streaming(path, is_csv):
+    from spreadsheet_io import stream_translate_file
+
+    def translate_chunk(items):
+        return {index: fake_translate(text) for index, text in items}
+
+    out_path = stream_translate_file(path, is_csv, IDX_SRC, IDX_TGT, "Column E", translate_chunk)
+    size = os.path.getsize(out_path)
+    os.remove(out_path)
+    return size
+
+
+def child(mode, path, is_csv):
+    tracemalloc.start()
+    started = time.perf_counter()
+    size = (run_legacy if mode == "legacy" else run_streaming)(path, is_csv)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{mode:9s} time={elapsed:7.2f}s traced_peak={peak / 2**20:8.1f}MB "
+          f"max_rss={max_rss:8.1f}MB output={size / 2**20:6.1f}MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--format", choices=["csv", "xlsx"], default="csv")
+    parser.add_argument("--modes", default="legacy,streaming")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--input", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    is_csv = args.format == "csv"
+
+    if args.child:
+        child(args.child, args.input, is_csv)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, f"input.{args.format}")
+        make_input(path, args.rows, is_csv)
+        print(f"rows={args.rows} format={args.format} input={os.path.getsize(path) / 2**20:.1f}MB")
+        for mode in args.modes.split(","):
+            subprocess.run([sys.executable, __file__, "--child", mode, "--input", path,
+                            "--format", args.format], check=True)
+
+
+if __name__ == "__main__":
+    main()
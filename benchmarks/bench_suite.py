@@ -0,0 +1,185 @@
+"""Tab 1/2/3 파이프라인 재현 벤치마크 (로컬 가짜 백엔드).
+
+1k/10k/100k행짜리 합성 시트로 세 파이프라인을 실행하고 rows/s, 최대 메모리(tracemalloc),
+모델 호출 수, 429/503 횟수, 토큰 수를 출력한다. 시드와 지연 시간 분포를 고정하므로 --json으로 저장한
+결과를 커밋 사이에 비교할 수 있다.
+
+- tab1: 실시간 번역처럼 행마다 StreamCoalescer + stream_translation 스트리밍 요청
+- tab2: FakeWorksheet에서 원문 컬럼만 읽고 Translator.run 결과를 ChunkedSheetWriter로 저장
+- tab3: 합성 CSV를 Translator.translate_file로 청크 단위 스트리밍 번역
+
+    python benchmarks/bench_suite.py --sizes 1000 10000 100000 --json bench.json
+    python benchmarks/bench_suite.py --sizes 10000 --pipelines tab2 tab3 --latency 0.05 --latency-dist lognormal --workers 32
+"""
+import argparse
+import csv
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from coalescing import StreamCoalescer  # noqa: E402
+from engine import RateLimiter  # noqa: E402
+from fake_backend import LATENCY_DISTRIBUTIONS, FakeBackend, FakeWorksheet  # noqa: E402
+from fuzzy_memory import FuzzyMemory  # noqa: E402
+from gemini_client import clear_models, stream_translation  # noqa: E402
+from pipeline import Translator, collect_items  # noqa: E402
+from prompts import CATEGORIES, LEVELS, build_master_prompt  # noqa: E402
+from sheets_io import ChunkedSheetWriter, read_columns  # noqa: E402
+from translation_memory import TranslationMemory  # noqa: E402
+
+IDX_SRC = 3
+IDX_TGT = 4
+HEADER = ["ID", "Key", "Type", "English", "Korean"]
+TEMPLATES = (
+    "You earned {n} coins in level {m}.",
+    "Hello {name}, your order #{n} has shipped.",
+    "Tap **Continue** to claim {n} free gems.",
+    "The event ends in {n} days. Don't miss out!",
+    "Season {m} brings {n} new stages and a new boss.",
+)
+WORDS = ("message account payment order delivery update profile friend photo event ticket reward "
+         "level coin item store notice setting password email review").split()
+
+
+def make_rows(size, seed=11, duplicate_rate=0.2, long_every=500):
+    """합성 원문: 템플릿 문장(숫자만 다름), 자유 문장, 중복, 가끔 여러 문단짜리 긴 셀."""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(size):
+        if rows and rng.random() < duplicate_rate:
+            rows.append(rng.choice(rows))
+        elif long_every and i % long_every == long_every - 1:
+            paragraphs = [" ".join(f"The {' '.join(rng.sample(WORDS, 4))} changed on day {rng.randint(1, 99)}."
+                                   for _ in range(8)) for _ in range(6)]
+            rows.append("\n\n".join(paragraphs))
+        elif rng.random() < 0.5:
+            rows.append(rng.choice(TEMPLATES).replace("{n}", str(rng.randint(1, 9999))).replace("{m}", str(rng.randint(1, 50))))
+        else:
+            words = rng.sample(WORDS, 6)
+            rows.append(f"Your {words[0]} {words[1]} needs a {words[2]} before the {words[3]} {words[4]} {words[5]}.")
+    return rows
+
+
+def make_backend(args):
+    clear_models()
+    return FakeBackend(latency=args.latency, latency_dist=args.latency_dist, latency_sigma=args.latency_sigma,
+                       error_rate=args.error_rate, rate_limit_rate=args.rate_limit_rate, seed=7)
+
+
+def make_translator(args, backend, directory):
+    memory = fuzzy = None
+    if args.memory:
+        memory = TranslationMemory(os.path.join(directory, "tm.sqlite3"))
+        fuzzy = FuzzyMemory(os.path.join(directory, "fuzzy.sqlite3"))
+    return Translator("bench", CATEGORIES[0], LEVELS[0], max_workers=args.workers, limiter=RateLimiter(0),
+                      batch_mode=args.batch, memory=memory, fuzzy=fuzzy, backend=backend,
+                      hedge=args.hedge, hedge_max_extra=args.hedge_max_extra)
+
+
+def run_tab1(rows, args, backend, directory):
+    model = backend.model("bench", build_master_prompt(CATEGORIES[0], LEVELS[0]))
+    coalescer = StreamCoalescer()
+
+    def translate(text):
+        stream, _ = coalescer.get_or_start((text, CATEGORIES[0], LEVELS[0]), lambda: stream_translation(model, text))
+        return "".join(stream.iter()) if stream.error is None else None
+
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        return sum(translated is not None for translated in executor.map(translate, rows))
+
+
+def run_tab2(rows, args, backend, directory):
+    worksheet = FakeWorksheet([HEADER] + [[str(i), f"key-{i}", "ui", text, ""] for i, text in enumerate(rows)])
+    headers, columns = read_columns(worksheet, [IDX_SRC, IDX_TGT])
+    df = pd.DataFrame(list(zip(*columns)), columns=headers)
+    writer = ChunkedSheetWriter(worksheet, IDX_TGT, chunk_size=200)
+    translator = make_translator(args, backend, directory)
+
+    def on_result(index, translated, done, total):
+        if translated is not None:
+            writer.add(index, translated)
+
+    try:
+        results = translator.run(collect_items(df, 0), on_result)
+    finally:
+        writer.close()
+    return len(results)
+
+
+def run_tab3(rows, args, backend, directory):
+    src_path = os.path.join(directory, "input.csv")
+    with open(src_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADER)
+        for i, text in enumerate(rows):
+            writer.writerow([i, f"key-{i}", "ui", text, ""])
+    translator = make_translator(args, backend, directory)
+    controller = translator.new_controller()
+    translator.translate_file(src_path, IDX_SRC, IDX_TGT, "Korean",
+                              out_path=os.path.join(directory, "output.csv"), controller=controller)
+    return len(rows) - len(controller.failures)
+
+
+PIPELINES = {"tab1": run_tab1, "tab2": run_tab2, "tab3": run_tab3}
+
+
+def measure(name, size, args):
+    rows = make_rows(size, duplicate_rate=args.duplicate_rate)
+    backend = make_backend(args)
+    with tempfile.TemporaryDirectory() as directory:
+        tracemalloc.start()
+        started = time.perf_counter()
+        ok = PIPELINES[name](rows, args, backend, directory)
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    result = {"pipeline": name, "rows": size, "ok_rows": ok, "seconds": round(elapsed, 3),
+              "rows_per_second": round(size / elapsed, 1), "peak_mb": round(peak / 2 ** 20, 1)}
+    result.update(backend.stats())
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--pipelines", nargs="+", choices=sorted(PIPELINES), default=sorted(PIPELINES))
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.0, help="가짜 호출 평균 지연 시간 (초)")
+    parser.add_argument("--latency-dist", choices=LATENCY_DISTRIBUTIONS, default="lognormal")
+    parser.add_argument("--latency-sigma", type=float, default=0.5)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="503 확률")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="429 확률")
+    parser.add_argument("--duplicate-rate", type=float, default=0.2)
+    parser.add_argument("--batch", action="store_true", help="Tab 2/3을 배치 모드로 실행")
+    parser.add_argument("--memory", action="store_true", help="임시 디렉터리의 번역 메모리/유사 문장 메모리 사용")
+    parser.add_argument("--hedge", action="store_true", help="Tab 2/3에서 느린 호출 헤징")
+    parser.add_argument("--hedge-max-extra", type=float, default=0.05)
+    parser.add_argument("--json", help="결과를 JSON 파일로 저장 (커밋 간 비교용)")
+    args = parser.parse_args()
+
+    results = []
+    for size in args.sizes:
+        for name in args.pipelines:
+            result = measure(name, size, args)
+            results.append(result)
+            print(f"{name} rows={size:>7,} ok={result['ok_rows']:>7,} time={result['seconds']:7.2f}s "
+                  f"rows/s={result['rows_per_second']:9,.1f} peak={result['peak_mb']:7.1f}MB "
+                  f"calls={result['calls']:>7,} 429={result['rate_limited']:>5} 503={result['server_errors']:>5} "
+                  f"tokens={result['prompt_tokens'] + result['output_tokens']:,}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "results": results}, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""명령줄 일괄 번역 (Streamlit 없이 실행).
+
+디렉터리나 glob 패턴으로 지정한 xlsx/csv 파일을 여러 개 동시에 번역한다.
+모든 파일이 하나의 RateLimiter를 공유하므로 파일 수와 관계없이 분당 요청 한도를 지킨다.
+
+    python cli.py data/*.xlsx --category News --level Advanced --source D --target E --out-dir translated
+    GEMINI_API_KEY=... python cli.py data/ --files-parallel 4 --rpm 300 --resume
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from engine import RateLimiter
+from gemini_client import BACKENDS, make_backend
+from job_store import JobStore, make_job_id, path_fingerprint
+from metrics import MODEL_PRICES, to_json, write_metrics
+from pipeline import Translator
+from prompts import CATEGORIES, LEVELS
+from sheets_io import column_index
+from fuzzy_memory import FuzzyMemory
+from translation_memory import TranslationMemory
+
+EXTENSIONS = (".xlsx", ".csv")
+
+
+def find_files(patterns):
+    """디렉터리, glob 패턴, 파일 경로를 xlsx/csv 파일 목록으로 펼친다 (중복 제거, 순서 유지)."""
+    files = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = sorted(glob.glob(os.path.join(pattern, "*")))
+        else:
+            matches = sorted(glob.glob(pattern)) or [pattern]
+        for path in matches:
+            if path.lower().endswith(EXTENSIONS) and os.path.isfile(path) and path not in files:
+                files.append(path)
+    return files
+
+
+def output_path(src_path, out_dir):
+    stem, suffix = os.path.splitext(os.path.basename(src_path))
+    return os.path.join(out_dir, f"{stem}_translated{suffix}")
+
+
+def translate_one(make_translator, src_path, args):
+    translator = make_translator()
+    idx_src = column_index(args.source)
+    idx_tgt = column_index(args.target)
+    job_id = make_job_id(path_fingerprint(src_path), args.category, args.level, args.source, args.target)
+    controller = translator.new_controller()
+    started = time.perf_counter()
+    out_path = translator.translate_file(
+        src_path, idx_src, idx_tgt, f"Column {args.target}",
+        out_path=output_path(src_path, args.out_dir), controller=controller,
+        job_id=job_id, resume=args.resume, chunk_size=args.chunk_size
+    )
+    summary = translator.metrics.summary(controller)
+    if args.metrics_dir:
+        stem = os.path.splitext(os.path.basename(src_path))[0]
+        labels = {"file": os.path.basename(src_path), "category": args.category, "level": args.level}
+        for extension in (".json", ".prom"):
+            write_metrics(os.path.join(args.metrics_dir, stem + "_metrics" + extension), summary, labels)
+        if translator.validate:
+            report = {"rules": translator.validation.summary(),
+                      "rows": {row + 1: violations for row, violations in sorted(translator.validation.rows.items())}}
+            with open(os.path.join(args.metrics_dir, stem + "_validation.json"), "w", encoding="utf-8") as f:
+                f.write(to_json(report))
+    if translator.validate:
+        summary["validation"] = translator.validation.describe()
+    return out_path, controller, summary, time.perf_counter() - started
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("inputs", nargs="+", help="xlsx/csv 파일, 디렉터리 또는 glob 패턴")
+    parser.add_argument("--category", choices=CATEGORIES, default=CATEGORIES[0])
+    parser.add_argument("--level", choices=LEVELS, default=LEVELS[0])
+    parser.add_argument("--source", default="D", help="원문 컬럼 (기본값: D)")
+    parser.add_argument("--target", default="E", help="번역 컬럼 (기본값: E)")
+    parser.add_argument("--out-dir", default="translated")
+    parser.add_argument("--api-key", default=os.environ.get("GEMINI_API_KEY"),
+                        help="Gemini API Key (기본값: 환경 변수 GEMINI_API_KEY)")
+    parser.add_argument("--workers", type=int, default=8, help="파일당 동시 요청 수")
+    parser.add_argument("--rpm", type=int, default=60, help="모든 파일이 공유하는 분당 요청 제한")
+    parser.add_argument("--files-parallel", type=int, default=2, help="동시에 처리할 파일 수")
+    parser.add_argument("--chunk-size", type=int, default=2000)
+    parser.add_argument("--batch", action="store_true", help="여러 행을 한 번에 요청하는 배치 모드")
+    parser.add_argument("--batch-rows", type=int, default=30)
+    parser.add_argument("--batch-token-budget", type=int, default=3000)
+    parser.add_argument("--segment-chars", type=int, default=1500,
+                        help="이보다 긴 셀은 문단/문장 경계에서 나눠 병렬 번역 (0이면 끔)")
+    parser.add_argument("--no-validate", action="store_true", help="번역 검수와 위반 행 재번역을 끔")
+    parser.add_argument("--no-memory", action="store_true", help="번역 메모리를 사용하지 않음")
+    parser.add_argument("--no-fuzzy", action="store_true", help="숫자/변수만 다른 문장 재사용과 유사 문장 참고를 끔")
+    parser.add_argument("--fuzzy-threshold", type=float, default=0.8)
+    parser.add_argument("--hedge", action="store_true", help="느린 호출에 같은 요청을 한 번 더 보내 먼저 온 응답을 사용")
+    parser.add_argument("--hedge-percentile", type=float, default=95, help="이 백분위수 지연을 넘기면 헤지 (기본값: 95)")
+    parser.add_argument("--hedge-max-extra", type=float, default=0.05, help="헤지로 늘어나는 호출의 최대 비율 (기본값: 0.05)")
+    parser.add_argument("--fallback-model", choices=sorted(MODEL_PRICES), help="거듭 느리거나 실패한 요청을 보낼 대체 모델")
+    parser.add_argument("--resume", action="store_true", help="체크포인트에 저장된 행은 건너뛰고 이어서 번역")
+    parser.add_argument("--metrics-dir", help="파일별 호출 지표를 JSON과 Prometheus 텍스트로 저장할 디렉터리")
+    parser.add_argument("--backend", choices=BACKENDS, default="gemini", help="모델 백엔드 (fake는 API 호출 없이 실행)")
+    parser.add_argument("--fake", action="store_true", help="--backend fake와 같음 (테스트용)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    for column in (args.source, args.target):
+        try:
+            column_index(column)
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            return 2
+    files = find_files(args.inputs)
+    if not files:
+        print("번역할 xlsx/csv 파일이 없습니다.", file=sys.stderr)
+        return 2
+
+    backend_name = "fake" if args.fake else args.backend
+    backend = make_backend(backend_name)
+    if backend_name == "gemini" and not args.api_key:
+        print("--api-key 또는 GEMINI_API_KEY 환경 변수가 필요합니다.", file=sys.stderr)
+        return 2
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    if args.metrics_dir:
+        os.makedirs(args.metrics_dir, exist_ok=True)
+    limiter = RateLimiter(args.rpm)
+    memory = None if args.no_memory else TranslationMemory()
+    fuzzy = None if args.no_memory or args.no_fuzzy else FuzzyMemory()
+    job_store = JobStore()
+
+    # 파일마다 Translator를 따로 만들어 지표를 파일 단위로 집계하되, RPM 한도와 저장소는 공유
+    def make_translator():
+        return Translator(
+            args.api_key or "fake", args.category, args.level,
+            max_workers=args.workers, limiter=limiter,
+            batch_mode=args.batch, batch_rows=args.batch_rows, batch_token_budget=args.batch_token_budget,
+            memory=memory, fuzzy=fuzzy, fuzzy_threshold=args.fuzzy_threshold,
+            hedge=args.hedge, hedge_percentile=args.hedge_percentile, hedge_max_extra=args.hedge_max_extra,
+            fallback_model=args.fallback_model,
+            job_store=job_store, backend=backend, segment_chars=args.segment_chars,
+            validate=not args.no_validate
+        )
+
+    failed_files = 0
+    with ThreadPoolExecutor(max_workers=max(1, args.files_parallel)) as executor:
+        futures = {executor.submit(translate_one, make_translator, path, args): path for path in files}
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                out_path, controller, summary, elapsed = future.result()
+            except Exception as e:
+                failed_files += 1
+                print(f"✗ {path}: {e}", file=sys.stderr)
+                continue
+            status = "✓" if not controller.failures else "△"
+            if controller.failures:
+                failed_files += 1
+            p95 = f"{summary['latency_p95']:.2f}s" if summary["latency_p95"] is not None else "-"
+            cost = f"${summary['estimated_cost_usd']:.4f}" if summary["estimated_cost_usd"] is not None else "-"
+            print(f"{status} {path} -> {out_path} ({elapsed:.1f}s, {summary['rows_per_second']:.1f} rows/s, "
+                  f"p95 {p95}, 토큰 {summary['prompt_tokens'] + summary['output_tokens']:,}, 비용 {cost}, "
+                  f"429 {summary['rate_limited']}회, 실패 {summary['failed_rows']}행)")
+            if summary["hedged_calls"] or summary["fallback_calls"]:
+                print(f"  헤지 {summary['hedged_calls']}회 (헤지 응답 채택 {summary['hedge_wins']}회) · "
+                      f"대체 모델 호출 {summary['fallback_calls']}회")
+            if "validation" in summary:
+                print(f"  {summary['validation']}")
+
+    return 1 if failed_files else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""실시간 번역 스트리밍과 동일 요청 병합(coalescing).
+
+스트리밍 생성은 백그라운드 스레드에서 돌면서 받은 조각을 공유 버퍼에 쌓는다.
+같은 키(원문, 카테고리, 레벨)로 진행 중인 요청이 있으면 새로 호출하지 않고 그 버퍼를 함께 읽는다.
+Streamlit 재실행으로 화면이 다시 그려져도 진행 중인 호출은 끊기지 않고 이어서 표시된다.
+"""
+import threading
+import time
+
+
+class InflightStream:
+    def __init__(self):
+        self.chunks = []
+        self.done = False
+        self.error = None
+        self.started = time.perf_counter()
+        self.first_token_at = None
+        self.finished_at = None
+        self.subscribers = 0
+        self._cond = threading.Condition()
+
+    def append(self, chunk):
+        with self._cond:
+            if self.first_token_at is None:
+                self.first_token_at = time.perf_counter()
+            self.chunks.append(chunk)
+            self._cond.notify_all()
+
+    def finish(self, error=None):
+        with self._cond:
+            self.error = error
+            self.done = True
+            self.finished_at = time.perf_counter()
+            self._cond.notify_all()
+
+    def iter(self):
+        """지금까지 받은 조각부터 차례로 돌려주고, 끝날 때까지 새 조각을 기다린다."""
+        position = 0
+        while True:
+            with self._cond:
+                while position >= len(self.chunks) and not self.done:
+                    self._cond.wait()
+                pending = self.chunks[position:]
+                position = len(self.chunks)
+                finished = self.done
+            for chunk in pending:
+                yield chunk
+            if finished and position >= len(self.chunks):
+                return
+
+    @property
+    def text(self):
+        return "".join(self.chunks)
+
+    @property
+    def time_to_first_token(self):
+        return self.first_token_at - self.started if self.first_token_at else None
+
+    @property
+    def total_latency(self):
+        return self.finished_at - self.started if self.finished_at else None
+
+
+class StreamCoalescer:
+    def __init__(self):
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def get_or_start(self, key, producer):
+        """진행 중인 같은 요청이 있으면 (stream, True), 없으면 새로 시작해서 (stream, False)를 반환한다.
+
+        producer()는 텍스트 조각을 내보내는 이터레이터를 반환한다.
+        """
+        with self._lock:
+            stream = self._inflight.get(key)
+            if stream is not None:
+                stream.subscribers += 1
+                return stream, True
+            stream = InflightStream()
+            stream.subscribers = 1
+            self._inflight[key] = stream
+
+        def run():
+            try:
+                for chunk in producer():
+                    if chunk:
+                        stream.append(chunk)
+                stream.finish()
+            except Exception as e:
+                stream.finish(error=e)
+            finally:
+                with self._lock:
+                    if self._inflight.get(key) is stream:
+                        del self._inflight[key]
+
+        threading.Thread(target=run, name="translation-stream", daemon=True).start()
+        return stream, False
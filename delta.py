@@ -0,0 +1,75 @@
+"""Delta 모드: 지난 실행 이후 원문이 바뀐 행만 번역한다.
+
+번역에 성공한 행마다 원문 해시를 사이드카 SQLite에 (문서 키, 행 번호) 기준으로 저장한다.
+다음 실행에서 번역이 이미 있고 원문 해시가 같은 행은 건너뛴다.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+
+from translation_memory import normalize_source
+
+DEFAULT_PATH = os.path.join(".translation_cache", "delta.sqlite3")
+
+
+def source_hash(text):
+    return hashlib.sha1(normalize_source(text).encode("utf-8")).hexdigest()[:16]
+
+
+def make_doc_key(*parts):
+    return "\x1f".join(str(part) for part in parts)
+
+
+class SourceHashStore:
+    def __init__(self, path=DEFAULT_PATH):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS source_hashes (
+                doc_key TEXT,
+                row_index INTEGER,
+                source_hash TEXT,
+                PRIMARY KEY (doc_key, row_index)
+            )
+        """)
+        self._conn.commit()
+
+    def hashes(self, doc_key):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT row_index, source_hash FROM source_hashes WHERE doc_key = ?", (doc_key,)
+            ).fetchall()
+        return dict(rows)
+
+    def record(self, doc_key, row_index, text):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO source_hashes VALUES (?, ?, ?)",
+                (doc_key, int(row_index), source_hash(text))
+            )
+            self._conn.commit()
+
+
+def is_unchanged(known_hashes, row_index, source_text, target_text):
+    """번역이 이미 있고 원문 해시가 저장된 값과 같으면 True."""
+    if not str(target_text or "").strip():
+        return False
+    return known_hashes.get(row_index) == source_hash(source_text)
+
+
+def split_changed(items, targets, known_hashes):
+    """(행 번호, 원문) 목록을 번역이 필요한 행과 건너뛸 행 수로 나눈다."""
+    changed = []
+    skipped = 0
+    for index, text in items:
+        if is_unchanged(known_hashes, index, text, targets.get(index)):
+            skipped += 1
+        else:
+            changed.append((index, text))
+    return changed, skipped
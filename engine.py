@@ -0,0 +1,106 @@
+"""동시 번역 엔진.
+
+행 단위 번역을 스레드 풀로 병렬 처리하고, 분당 요청 수(RPM) 제한으로 호출 속도를 맞춘다.
+결과는 행 인덱스 기준으로 돌려주므로 완료 순서와 상관없이 원래 순서가 유지된다.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from rate_control import PERMANENT, AdaptiveController, TranslationFailed
+
+
+# 분당 요청 수 제한 (고정 sleep 대체)
+class RateLimiter:
+    def __init__(self, rpm):
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+        self.set_rpm(rpm)
+
+    def set_rpm(self, rpm):
+        with self._lock:
+            self.rpm = rpm
+            self._interval = 60.0 / rpm if rpm and rpm > 0 else 0.0
+
+    def acquire(self):
+        if not self._interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(self._next_slot, now)
+            self._next_slot = slot + self._interval
+        wait = slot - now
+        if wait > 0:
+            time.sleep(wait)
+
+    def try_slot(self):
+        """기다리지 않고 지금 간격을 받을 수 있으면 받는다 (헤지처럼 건너뛰어도 되는 호출용).
+
+        받았으면 반납 함수를, 아니면 None을 반환한다. 동시 요청 수는 세지 않으므로 반납 함수는 하는 일이 없다.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._interval and self._next_slot > now:
+                return None
+            self._next_slot = now + self._interval
+        return _release_nothing
+
+    def hold(self):
+        return _release_nothing
+
+
+def _release_nothing():
+    pass
+
+
+def translate_rows(items, translate_fn, max_workers=8, rpm=60, on_result=None, limiter=None,
+                   controller=None, attempts=3, retry_attempts=5):
+    """(index, text) 목록을 병렬 번역해서 {index: 번역} 딕셔너리로 반환한다.
+
+    on_result(index, translated, done, total)는 호출한 스레드에서 실행되므로
+    Streamlit 진행 표시줄을 그대로 갱신할 수 있다. limiter를 넘기면 여러 작업이 같은 RPM 예산을 나눠 쓴다.
+    재시도 가능한 오류로 실패한 행은 재시도 큐에 모았다가 마지막에 다시 처리하고, 끝내 실패한 행은
+    translated=None으로 알리며 결과에서 빠진다 (실패 사유는 controller.failures).
+    """
+    items = list(items)
+    total = len(items)
+    results = {}
+    if not total:
+        return results
+
+    controller = controller or AdaptiveController(max_workers, limiter or RateLimiter(rpm))
+    done = 0
+
+    def finish(index, translated):
+        nonlocal done
+        done += 1
+        if translated is not None:
+            results[index] = translated
+        if on_result:
+            on_result(index, translated, done, total)
+
+    def run_pass(batch, tries, retry_queue=None):
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = {
+                executor.submit(controller.call, translate_fn, text, attempts=tries): (index, text)
+                for index, text in batch
+            }
+            for future in as_completed(futures):
+                index, text = futures[future]
+                try:
+                    translated = future.result()
+                except TranslationFailed as failure:
+                    if retry_queue is not None and failure.kind != PERMANENT:
+                        retry_queue.append((index, text))
+                        continue
+                    controller.record_failure(index, failure)
+                    translated = None
+                finish(index, translated)
+
+    retry_queue = []
+    run_pass(items, attempts, retry_queue)
+    # 할당량 초과/일시 오류로 밀린 행은 마지막에 한 번 더 처리
+    if retry_queue:
+        run_pass(retry_queue, retry_attempts)
+
+    return results
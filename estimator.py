@@ -0,0 +1,124 @@
+"""번역 시작 전 사전 견적 (dry run).
+
+원문 컬럼에서 비어 있지 않은 셀과 중복을 뺀 셀 수를 세고, 마스터 프롬프트와 원문의 토큰 수를
+로컬 근사치(batching.estimate_tokens와 같은 규칙)로 계산해 모델 호출 수, 총 토큰, 예상 비용,
+예상 소요 시간을 낸다. 행마다 파이썬 루프를 돌지 않고 pandas 문자열 연산으로 한 번에 계산하므로
+10만 행도 1초 안에 끝난다.
+"""
+import math
+
+from batching import BATCH_INSTRUCTION, estimate_tokens
+from gemini_client import MODEL_NAME
+from metrics import MODEL_PRICES
+
+# 영→한 번역 출력 토큰 / 원문 토큰 (estimate_tokens 기준 근사치)
+OUTPUT_TOKEN_RATIO = 1.3
+# make_batches가 행마다 더하는 id/JSON 토큰
+ROW_OVERHEAD_TOKENS = 8
+# 호출 1회 평균 지연 시간 (초). 지난 실행의 p50을 넘겨 주면 더 정확하다
+DEFAULT_LATENCY = 3.0
+
+
+def source_stats(values, segment_chars=1500):
+    """원문 값 목록(Series 또는 iterable)의 셀 수, 고유 셀 수, 고유 원문 토큰 수, 분할 조각 수를 센다.
+
+    고유 여부는 normalize_source처럼 공백을 하나로 합친 원문 기준이다.
+    """
+    import pandas as pd
+
+    series = values if isinstance(values, pd.Series) else pd.Series(list(values), dtype=object)
+    text = series.dropna().astype(str)
+    normalized = text.str.replace(r"\s+", " ", regex=True).str.strip()
+    non_empty = normalized.ne("")
+    unique = non_empty & ~normalized.duplicated()
+    unique_text = text[unique]
+
+    lengths = unique_text.str.len()
+    non_ascii = unique_text.str.count(r"[^\x00-\x7f]")
+    tokens = (lengths - non_ascii) // 4 + non_ascii + 1
+    if segment_chars:
+        long_cells = lengths > segment_chars
+        segments = int((-(-lengths[long_cells] // segment_chars)).sum())
+    else:
+        long_cells = lengths.lt(0)
+        segments = 0
+    return {
+        "rows": len(series),
+        "non_empty": int(non_empty.sum()),
+        "unique": int(unique.sum()),
+        "source_tokens": int(tokens.sum()),
+        "long_cells": int(long_cells.sum()),
+        "long_tokens": int(tokens[long_cells].sum()),
+        "segments": segments,
+    }
+
+
+def estimate_job(values, system_prompt, model_name=MODEL_NAME, rpm=60, max_workers=8,
+                 batch_mode=False, batch_rows=30, batch_token_budget=3000, cache_hit_rate=0.0,
+                 segment_chars=1500, context_chars=200, latency=DEFAULT_LATENCY, prices=None):
+    """원문 값 목록을 실제로 번역할 때의 호출 수, 토큰, 비용, 소요 시간을 추정한다.
+
+    cache_hit_rate(0~1)만큼의 고유 원문은 번역 메모리에서 바로 채워진다고 보고,
+    분할 기준을 넘는 긴 셀은 조각마다 한 번씩(배치 모드에서도 단건으로) 호출한다고 본다.
+    """
+    stats = source_stats(values, segment_chars)
+    cache_hit_rate = min(max(cache_hit_rate, 0.0), 1.0)
+    send = 1.0 - cache_hit_rate
+    system_tokens = estimate_tokens(system_prompt)
+
+    short_rows = (stats["unique"] - stats["long_cells"]) * send
+    short_tokens = (stats["source_tokens"] - stats["long_tokens"]) * send
+    segment_calls = stats["segments"] * send
+    # 조각마다 앞뒤 문맥(context_chars자씩)이 같이 간다
+    segment_tokens = stats["long_tokens"] * send + segment_calls * (2 * context_chars // 4)
+
+    if batch_mode:
+        row_tokens = short_tokens + ROW_OVERHEAD_TOKENS * short_rows
+        batch_calls = math.ceil(max(short_rows / max(batch_rows, 1), row_tokens / max(batch_token_budget, 1)))
+        prompt_tokens = batch_calls * (system_tokens + estimate_tokens(BATCH_INSTRUCTION)) + row_tokens
+    else:
+        batch_calls = math.ceil(short_rows)
+        prompt_tokens = batch_calls * system_tokens + short_tokens
+    calls = batch_calls + math.ceil(segment_calls)
+    prompt_tokens += math.ceil(segment_calls) * system_tokens + segment_tokens
+    output_tokens = (short_tokens + stats["long_tokens"] * send) * OUTPUT_TOKEN_RATIO
+
+    prices = prices if prices is not None else MODEL_PRICES.get(model_name)
+    cost = None
+    if prices:
+        cost = (prompt_tokens * prices[0] + output_tokens * prices[1]) / 1_000_000
+
+    # RPM 간격과 동시 요청 수 중 더 느린 쪽이 전체 시간을 정한다
+    rpm_seconds = calls * 60.0 / rpm if rpm else 0.0
+    worker_seconds = calls * latency / max(max_workers, 1)
+    stats.update({
+        "system_prompt_tokens": system_tokens,
+        "cache_hit_rate": cache_hit_rate,
+        "calls": calls,
+        "prompt_tokens": int(prompt_tokens),
+        "output_tokens": int(output_tokens),
+        "estimated_cost_usd": cost,
+        "estimated_seconds": max(rpm_seconds, worker_seconds),
+        "bottleneck": "rpm" if rpm_seconds >= worker_seconds else "workers",
+    })
+    return stats
+
+
+def format_duration(seconds):
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{seconds}초"
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return f"{minutes}분 {seconds}초"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}시간 {minutes}분"
+
+
+def describe_estimate(estimate):
+    cost = estimate["estimated_cost_usd"]
+    bottleneck = "분당 요청 제한" if estimate["bottleneck"] == "rpm" else "동시 요청 수"
+    return (f"원문 {estimate['non_empty']:,}셀 (고유 {estimate['unique']:,}) · 모델 호출 약 {estimate['calls']:,}회 · "
+            f"토큰 약 {estimate['prompt_tokens'] + estimate['output_tokens']:,} · "
+            f"비용 약 {'$' + format(cost, '.2f') if cost is not None else '-'} · "
+            f"예상 시간 {format_duration(estimate['estimated_seconds'])} ({bottleneck} 기준)")
@@ -0,0 +1,277 @@
+"""벤치마크용 로컬 가짜 Gemini 백엔드와 가짜 gspread 워크시트.
+
+google.generativeai 모듈과 같은 모양(configure, GenerativeModel, generate_content)을 흉내 내며,
+네트워크 없이 지연 시간 분포, 429/503 오류율, 토큰 수를 시뮬레이션한다. FakeBackend는 이를
+gemini_client.GeminiBackend와 같은 백엔드 인터페이스로 감싼다. FakeWorksheet는 gspread Worksheet의
+batch_get / batch_update / get_all_values를 메모리 위의 표로 흉내 내고, FakeSpreadsheet는 워크시트 목록을 묶는다.
+"""
+import json
+import math
+import random
+import re
+import threading
+import time
+from collections import deque
+
+from batching import estimate_tokens
+from gemini_client import GeminiBackend
+from sheets_io import column_index
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "exponential", "lognormal")
+
+
+class FakeAPIError(Exception):
+    def __init__(self, code, message):
+        super().__init__(f"{code} {message}")
+        self.code = code
+
+
+class FakeUsage:
+    def __init__(self, prompt_tokens, output_tokens):
+        self.prompt_token_count = prompt_tokens
+        self.candidates_token_count = output_tokens
+        self.total_token_count = prompt_tokens + output_tokens
+
+
+class FakeResponse:
+    def __init__(self, text, usage_metadata):
+        self.text = text
+        self.usage_metadata = usage_metadata
+
+
+def fake_translate(text):
+    return f"[KO] {text}"
+
+
+def fake_reply(contents):
+    """프롬프트 형식(단일 행 / JSON 배치)에 맞춰 가짜 번역 응답을 만든다."""
+    if "[Source Rows]:" in contents:
+        payload = contents.split("[Source Rows]:", 1)[1].rsplit("[Translations]:", 1)[0]
+        rows = json.loads(payload.strip())
+        return json.dumps({row["id"]: fake_translate(row["text"]) for row in rows}, ensure_ascii=False)
+    if "[Source Text]:" in contents:
+        source = contents.split("[Source Text]:", 1)[1].rsplit("[Translation]:", 1)[0]
+        return fake_translate(source.strip())
+    return fake_translate(contents.strip())
+
+
+class FakeChunk:
+    def __init__(self, text):
+        self.text = text
+
+
+def _stream_chunks(text, delay):
+    for start in range(0, len(text), 8):
+        time.sleep(delay)
+        yield FakeChunk(text[start:start + 8])
+
+
+class FakeModel:
+    def __init__(self, backend, model_name, system_instruction=None):
+        self.backend = backend
+        self.model_name = model_name
+        self.system_instruction = system_instruction
+        if backend.model_init_cost:
+            time.sleep(backend.model_init_cost)
+
+    def generate_content(self, contents, generation_config=None, stream=False):
+        self.backend.admit()
+        try:
+            return self._generate(contents, stream)
+        finally:
+            self.backend.release()
+
+    def _generate(self, contents, stream):
+        prompt = (self.system_instruction or "") + contents
+        prompt_tokens = estimate_tokens(prompt)
+        text = fake_reply(contents)
+        self.backend.record(prompt_tokens, estimate_tokens(text), len(contents))
+        latency = self.backend.sample_latency()
+        if stream:
+            time.sleep(prompt_tokens * self.backend.per_token_latency)
+            chunks = max(1, (len(text) + 7) // 8)
+            return _stream_chunks(text, latency / chunks)
+        time.sleep(latency + prompt_tokens * self.backend.per_token_latency)
+        return FakeResponse(text, FakeUsage(prompt_tokens, estimate_tokens(text)))
+
+
+class FakeGenAI:
+    """quota_concurrency/quota_rpm을 넘는 요청과 rate_limit_rate 확률로 429를, error_rate 확률로 503을 돌려준다.
+
+    호출 지연 시간은 평균이 latency인 latency_dist 분포에서 뽑는다. lognormal은 latency_sigma로 꼬리 길이를 정한다.
+    """
+
+    def __init__(self, latency=0.0, per_token_latency=0.0, configure_cost=0.0, model_init_cost=0.0,
+                 quota_concurrency=None, quota_rpm=None, error_rate=0.0, seed=None,
+                 latency_dist="fixed", latency_sigma=0.5, rate_limit_rate=0.0):
+        if latency_dist not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"unknown latency distribution: {latency_dist}")
+        self.latency = latency
+        self.latency_dist = latency_dist
+        self.latency_sigma = latency_sigma
+        self.rate_limit_rate = rate_limit_rate
+        self.per_token_latency = per_token_latency
+        self.configure_cost = configure_cost
+        self.model_init_cost = model_init_cost
+        self.quota_concurrency = quota_concurrency
+        self.quota_rpm = quota_rpm
+        self.error_rate = error_rate
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.output_tokens = 0
+        self.content_chars = 0
+        self.rate_limited = 0
+        self.server_errors = 0
+        self.in_flight = 0
+        self._recent = deque()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def admit(self):
+        with self._lock:
+            now = time.monotonic()
+            while self._recent and now - self._recent[0] > 60:
+                self._recent.popleft()
+            over_concurrency = self.quota_concurrency and self.in_flight >= self.quota_concurrency
+            over_rpm = self.quota_rpm and len(self._recent) >= self.quota_rpm
+            if over_concurrency or over_rpm or (self.rate_limit_rate and self._random.random() < self.rate_limit_rate):
+                self.rate_limited += 1
+                raise FakeAPIError(429, "Resource has been exhausted (e.g. check quota).")
+            if self.error_rate and self._random.random() < self.error_rate:
+                self.server_errors += 1
+                raise FakeAPIError(503, "The service is currently unavailable.")
+            self._recent.append(now)
+            self.in_flight += 1
+
+    def sample_latency(self):
+        if not self.latency or self.latency_dist == "fixed":
+            return self.latency
+        with self._lock:
+            if self.latency_dist == "uniform":
+                return self._random.uniform(0, 2 * self.latency)
+            if self.latency_dist == "exponential":
+                return self._random.expovariate(1 / self.latency)
+            # 평균이 latency가 되도록 mu를 맞춘 로그정규 분포
+            mu = math.log(self.latency) - self.latency_sigma ** 2 / 2
+            return self._random.lognormvariate(mu, self.latency_sigma)
+
+    def release(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    def configure(self, api_key=None):
+        if self.configure_cost:
+            time.sleep(self.configure_cost)
+
+    def GenerativeModel(self, model_name, system_instruction=None):
+        return FakeModel(self, model_name, system_instruction)
+
+    def record(self, prompt_tokens, output_tokens, content_chars):
+        with self._lock:
+            self.calls += 1
+            self.prompt_tokens += prompt_tokens
+            self.output_tokens += output_tokens
+            self.content_chars += content_chars
+
+
+class FakeBackend(GeminiBackend):
+    """로컬 가짜 백엔드. options는 FakeGenAI 설정이며, 호출/토큰/오류 집계는 stats()로 본다."""
+
+    name = "fake"
+
+    def __init__(self, **options):
+        super().__init__(FakeGenAI(**options))
+
+    def stats(self):
+        genai = self.genai_module
+        return {
+            "calls": genai.calls,
+            "prompt_tokens": genai.prompt_tokens,
+            "output_tokens": genai.output_tokens,
+            "rate_limited": genai.rate_limited,
+            "server_errors": genai.server_errors,
+        }
+
+
+_A1_RANGE = re.compile(r"^([A-Z]+)(\d+)(?::([A-Z]+)(\d*))?$")
+
+
+class FakeWorksheet:
+    def __init__(self, rows, fail_writes=0, title="Sheet1"):
+        self.title = title
+        self.rows = [list(row) for row in rows]
+        self.fail_writes = fail_writes
+        self.read_calls = 0
+        self.write_calls = 0
+        self.cells_read = 0
+        self.cells_written = 0
+        self._lock = threading.Lock()
+
+    def _parse(self, a1):
+        match = _A1_RANGE.match(a1)
+        if not match:
+            raise ValueError(f"unsupported range: {a1}")
+        first_col, first_row, last_col, last_row = match.groups()
+        last_col = last_col or first_col
+        last_row = int(last_row) if last_row else None
+        return column_index(first_col), int(first_row) - 1, column_index(last_col), last_row
+
+    def get_all_values(self):
+        with self._lock:
+            self.read_calls += 1
+            self.cells_read += sum(len(row) for row in self.rows)
+            return [list(row) for row in self.rows]
+
+    def batch_get(self, ranges):
+        with self._lock:
+            self.read_calls += 1
+            result = []
+            for a1 in ranges:
+                first_col, first_row, last_col, last_row = self._parse(a1)
+                rows = self.rows[first_row:last_row]
+                values = [[cell for cell in row[first_col:last_col + 1]] for row in rows]
+                while values and not any(values[-1]):
+                    values.pop()
+                values = [row if any(row) else [] for row in values]
+                self.cells_read += sum(len(row) for row in values)
+                result.append(values)
+            return result
+
+    def batch_update(self, data, value_input_option=None):
+        with self._lock:
+            self.write_calls += 1
+            if self.fail_writes:
+                self.fail_writes -= 1
+                raise RuntimeError("fake write failure")
+            for entry in data:
+                first_col, first_row, _, _ = self._parse(entry["range"])
+                for offset, values in enumerate(entry["values"]):
+                    row_index = first_row + offset
+                    while len(self.rows) <= row_index:
+                        self.rows.append([])
+                    row = self.rows[row_index]
+                    for col_offset, value in enumerate(values):
+                        col = first_col + col_offset
+                        row.extend([""] * (col + 1 - len(row)))
+                        row[col] = value
+                        self.cells_written += 1
+
+
+class FakeSpreadsheet:
+    """gspread Spreadsheet의 worksheets() / worksheet(title) / sheet1만 흉내 낸다."""
+
+    def __init__(self, worksheets):
+        self._worksheets = list(worksheets)
+
+    def worksheets(self):
+        return list(self._worksheets)
+
+    def worksheet(self, title):
+        for worksheet in self._worksheets:
+            if worksheet.title == title:
+                return worksheet
+        raise KeyError(title)
+
+    @property
+    def sheet1(self):
+        return self._worksheets[0]
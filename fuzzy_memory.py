@@ -0,0 +1,273 @@
+"""자리표시자 정규화 번역 메모리와 MinHash 유사 문장 색인.
+
+숫자와 `{변수}`를 슬롯으로 가린 원문(템플릿)을 키로 삼아, "You have 3 new messages"와
+"You have 12 new messages"처럼 값만 다른 행은 번역 하나를 재사용하고 값만 다시 채운다.
+번역문에서 각 값이 정확히 한 번씩 나타나 슬롯 위치를 확실히 알 수 있을 때만 템플릿을 저장한다.
+
+템플릿의 문자 3-gram MinHash 서명을 LSH 밴드로 나눠 SQLite에 색인하므로, 항목이 100만 건이어도
+유사 문장 후보는 밴드 키 인덱스 조회 몇 번으로 찾는다. 후보는 실제 Jaccard 유사도로 다시 거른다.
+"""
+import hashlib
+import os
+import re
+import sqlite3
+import struct
+import threading
+import time
+
+from translation_memory import normalize_source
+
+DEFAULT_PATH = os.path.join(".translation_cache", "fuzzy_memory.sqlite3")
+
+_MASK_PATTERN = re.compile(r"\{[^{}\s]+\}|\d+(?:[.,:]\d+)*")
+_SLOT_PATTERN = re.compile(r"⟦(\d+)⟧")
+
+NUM_PERM = 60
+BANDS = 12
+ROWS_PER_BAND = NUM_PERM // BANDS
+_UNPACK = struct.Struct(f"<{NUM_PERM}I").unpack
+
+
+def mask_source(text):
+    """숫자와 {변수}를 ⟦0⟧, ⟦1⟧ ... 슬롯으로 바꾼 템플릿과 원래 값 목록을 반환한다."""
+    values = []
+
+    def replace(match):
+        values.append(match.group(0))
+        return f"⟦{len(values) - 1}⟧"
+
+    return _MASK_PATTERN.sub(replace, normalize_source(text)), values
+
+
+def fill_slots(template, values):
+    return _SLOT_PATTERN.sub(lambda match: values[int(match.group(1))], template)
+
+
+def _value_pattern(value):
+    # 숫자는 더 긴 숫자의 일부(12 안의 1)와 겹치지 않도록 앞뒤 숫자를 배제
+    if value.startswith("{"):
+        return re.escape(value)
+    return rf"(?<![\d.,]){re.escape(value)}(?![\d]|[.,:]\d)"
+
+
+def make_translation_template(translation, values):
+    """번역문에서 원문 값이 나타난 자리를 슬롯으로 바꾼다. 위치가 모호하면 None."""
+    if not values or len(set(values)) != len(values):
+        return None
+    spans = []
+    for slot, value in enumerate(values):
+        matches = list(re.finditer(_value_pattern(value), translation))
+        if len(matches) != 1:
+            return None
+        spans.append((matches[0].start(), matches[0].end(), slot))
+    spans.sort()
+    for (_, end, _), (start, _, _) in zip(spans, spans[1:]):
+        if start < end:
+            return None
+    parts = []
+    position = 0
+    for start, end, slot in spans:
+        parts.append(translation[position:start])
+        parts.append(f"⟦{slot}⟧")
+        position = end
+    parts.append(translation[position:])
+    return "".join(parts)
+
+
+def shingles(text, n=3):
+    text = text.lower()
+    if len(text) <= n:
+        return {text}
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+def jaccard(a, b):
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def minhash(shingle_set):
+    # shake_128 한 번으로 조각마다 NUM_PERM개의 32비트 해시를 얻고, 열마다 최솟값을 취한다
+    rows = [_UNPACK(hashlib.shake_128(shingle.encode("utf-8")).digest(NUM_PERM * 4))
+            for shingle in shingle_set or {""}]
+    return list(map(min, zip(*rows)))
+
+
+def band_keys(signature, scope):
+    """LSH 밴드마다 (범위, 밴드 번호, 서명 조각)을 64비트 정수 키로 만든다."""
+    keys = []
+    for band in range(BANDS):
+        chunk = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+        raw = f"{scope}\x1f{band}\x1f{','.join(map(str, chunk))}".encode("utf-8")
+        keys.append(int.from_bytes(hashlib.blake2b(raw, digest_size=8).digest(), "big", signed=True))
+    return keys
+
+
+class FuzzyMemory:
+    def __init__(self, path=DEFAULT_PATH, max_entries=1000000):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.max_entries = max_entries
+        self.template_hits = 0
+        self.near_hits = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS templates (
+                id INTEGER PRIMARY KEY,
+                key TEXT UNIQUE,
+                category TEXT,
+                level TEXT,
+                model TEXT,
+                prompt_hash TEXT,
+                source TEXT,
+                template TEXT,
+                translation TEXT,
+                translation_template TEXT,
+                last_used REAL
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS bands (
+                band_key INTEGER,
+                entry_id INTEGER,
+                PRIMARY KEY (band_key, entry_id)
+            ) WITHOUT ROWID
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_bands_entry ON bands(entry_id)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_templates_last_used ON templates(last_used)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_templates_scope ON templates(category, level, model)")
+        self._conn.commit()
+        # 항목이 많아도 put마다 COUNT(*)를 하지 않도록 개수를 메모리에서 관리
+        self._count = self._conn.execute("SELECT COUNT(*) FROM templates").fetchone()[0]
+
+    mask = staticmethod(mask_source)
+
+    @staticmethod
+    def _scope(category, level, model, prompt_hash):
+        return "\x1f".join([category, level, model, prompt_hash])
+
+    @staticmethod
+    def _key(template, scope):
+        return hashlib.sha256(f"{scope}\x1f{template}".encode("utf-8")).hexdigest()
+
+    def get(self, source, category, level, model, prompt_hash):
+        """값만 다른 원문의 번역이 있으면 새 값을 채운 번역을, 없으면 None을 반환한다."""
+        template, values = mask_source(source)
+        if not values:
+            return None
+        key = self._key(template, self._scope(category, level, model, prompt_hash))
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT translation_template FROM templates WHERE key = ? AND translation_template IS NOT NULL",
+                (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self.template_hits += 1
+            self._conn.execute("UPDATE templates SET last_used = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+        return fill_slots(row[0], values)
+
+    def put(self, source, category, level, model, prompt_hash, translation):
+        """원문을 유사 문장 색인에 넣고, 슬롯 위치가 확실하면 번역 템플릿도 저장한다."""
+        template, values = mask_source(source)
+        scope = self._scope(category, level, model, prompt_hash)
+        translation_template = make_translation_template(translation, values)
+        key = self._key(template, scope)
+        with self._lock:
+            row = self._conn.execute("SELECT id FROM templates WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                self._conn.execute(
+                    "UPDATE templates SET source = ?, translation = ?, "
+                    "translation_template = COALESCE(?, translation_template), last_used = ? WHERE id = ?",
+                    (normalize_source(source), translation, translation_template, time.time(), row[0])
+                )
+                self._conn.commit()
+                return
+        signature = minhash(shingles(template))
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO templates (key, category, level, model, prompt_hash, source, template, "
+                "translation, translation_template, last_used) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, category, level, model, prompt_hash, normalize_source(source), template,
+                 translation, translation_template, time.time())
+            )
+            # 다른 스레드가 먼저 같은 템플릿을 넣었으면 색인은 이미 있다
+            if cursor.rowcount:
+                self._count += 1
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO bands VALUES (?, ?)",
+                    [(band_key, cursor.lastrowid) for band_key in band_keys(signature, scope)]
+                )
+            self._conn.commit()
+            self._evict()
+
+    def near_matches(self, source, category, level, model, prompt_hash, threshold=0.8, limit=3,
+                     max_candidates=200):
+        """템플릿 유사도가 threshold 이상인 (유사도, 원문, 번역) 목록을 유사도 순으로 반환한다.
+
+        템플릿이 완전히 같은 항목은 get()이 처리하므로 제외한다.
+        """
+        template, _ = mask_source(source)
+        query = shingles(template)
+        keys = band_keys(minhash(query), self._scope(category, level, model, prompt_hash))
+        marks = ",".join("?" * len(keys))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT source, template, translation FROM templates WHERE id IN "
+                f"(SELECT DISTINCT entry_id FROM bands WHERE band_key IN ({marks}) LIMIT ?)",
+                (*keys, max_candidates)
+            ).fetchall()
+        matches = []
+        for candidate_source, candidate_template, translation in rows:
+            if candidate_template == template:
+                continue
+            similarity = jaccard(query, shingles(candidate_template))
+            if similarity >= threshold:
+                matches.append((similarity, candidate_source, translation))
+        matches.sort(key=lambda match: match[0], reverse=True)
+        if matches:
+            with self._lock:
+                self.near_hits += 1
+        return matches[:limit]
+
+    def purge_stale(self, category, level, model, prompt_hash):
+        """같은 카테고리/레벨/모델에서 현재 프롬프트 해시와 다른 항목을 삭제한다."""
+        with self._lock:
+            ids = [row[0] for row in self._conn.execute(
+                "SELECT id FROM templates WHERE category = ? AND level = ? AND model = ? AND prompt_hash != ?",
+                (category, level, model, prompt_hash)
+            )]
+            self._delete(ids)
+            self._conn.commit()
+        return len(ids)
+
+    def _delete(self, ids):
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            marks = ",".join("?" * len(chunk))
+            self._conn.execute(f"DELETE FROM bands WHERE entry_id IN ({marks})", chunk)
+            self._count -= self._conn.execute(f"DELETE FROM templates WHERE id IN ({marks})", chunk).rowcount
+
+    def _evict(self):
+        if self._count <= self.max_entries:
+            return
+        # 오래 사용되지 않은 항목부터 최대 크기의 90%까지 정리
+        remove = self._count - int(self.max_entries * 0.9)
+        ids = [row[0] for row in self._conn.execute(
+            "SELECT id FROM templates ORDER BY last_used LIMIT ?", (remove,)
+        )]
+        self._delete(ids)
+        self._conn.commit()
+
+    def __len__(self):
+        return self._count
+
+    def stats(self):
+        return {"entries": len(self), "template_hits": self.template_hits, "near_hits": self.near_hits}
@@ -0,0 +1,128 @@
+"""Gemini 클라이언트/세션 계층.
+
+(api_key, 모델 이름, 시스템 프롬프트) 조합마다 GenerativeModel을 한 번만 만들고 재사용한다.
+고정 프롬프트는 system_instruction으로 넘기고, 행마다 보내는 내용은 원문만 남긴다.
+
+모델 백엔드는 model(api_key, system_instruction, model_name)으로 generate_content(contents, stream=...)를
+가진 모델을 돌려주는 객체이다. 기본은 GeminiBackend이고, make_backend("fake")는 네트워크 없이
+지연 시간/오류율/토큰 수를 흉내 내는 fake_backend.FakeBackend를 돌려준다.
+"""
+import hashlib
+import threading
+
+MODEL_NAME = 'gemini-2.5-flash'
+
+_models = {}
+_clients = {}
+_lock = threading.Lock()
+
+
+def _load_genai():
+    import google.generativeai as genai
+    return genai
+
+
+def _client_for(genai, api_key):
+    """api_key 전용 GenerativeService 클라이언트. _lock을 잡은 상태에서 호출한다.
+
+    genai.configure는 프로세스 전역 설정이고 GenerativeModel은 첫 호출 때 그 시점의 전역 클라이언트를
+    가져가므로, 여러 세션이 서로 다른 키를 쓰면 다른 사람의 키로 호출될 수 있다. 키마다 configure 직후
+    클라이언트를 만들어 두고 모델에 직접 묶어 전역 설정이 바뀌어도 영향을 받지 않게 한다.
+    같은 모양의 가짜 모듈처럼 client 모듈이 없으면 None을 반환한다.
+    """
+    key = (api_key, id(genai))
+    if key not in _clients:
+        genai.configure(api_key=api_key)
+        make_client = getattr(getattr(genai, "client", None), "get_default_generative_client", None)
+        _clients[key] = make_client() if make_client else None
+    return _clients[key]
+
+
+def get_model(api_key, system_instruction, model_name=MODEL_NAME, genai_module=None):
+    """캐시된 GenerativeModel을 반환한다. 처음 요청된 조합일 때만 새로 만든다."""
+    prompt_hash = hashlib.sha256(system_instruction.encode("utf-8")).hexdigest()
+    key = (api_key, model_name, prompt_hash, id(genai_module))
+    model = _models.get(key)
+    if model is not None:
+        return model
+
+    with _lock:
+        model = _models.get(key)
+        if model is None:
+            genai = genai_module or _load_genai()
+            client = _client_for(genai, api_key)
+            model = genai.GenerativeModel(model_name, system_instruction=system_instruction)
+            if client is not None:
+                model._client = client
+            _models[key] = model
+    return model
+
+
+class GeminiBackend:
+    """google.generativeai 백엔드. genai_module에 같은 모양의 모듈을 넣으면 그 모듈로 모델을 만든다."""
+
+    name = "gemini"
+
+    def __init__(self, genai_module=None):
+        self.genai_module = genai_module
+
+    def model(self, api_key, system_instruction, model_name=MODEL_NAME):
+        return get_model(api_key, system_instruction, model_name, genai_module=self.genai_module)
+
+
+BACKENDS = ("gemini", "fake")
+
+
+def make_backend(name="gemini", **options):
+    """이름으로 백엔드를 만든다. options는 fake 백엔드의 FakeGenAI 설정(latency, error_rate 등)이다."""
+    if name == "gemini":
+        return GeminiBackend()
+    if name == "fake":
+        from fake_backend import FakeBackend
+        return FakeBackend(**options)
+    raise ValueError(f"unknown backend: {name} (choose from {', '.join(BACKENDS)})")
+
+
+def clear_models():
+    with _lock:
+        _models.clear()
+        _clients.clear()
+
+
+def source_content(text, examples=None):
+    """examples에 (원문, 번역) 쌍이 있으면 참고 번역(few-shot)으로 앞에 붙인다."""
+    if not examples:
+        return f"[Source Text]: {text}\n[Translation]:"
+    references = "\n".join(f"- {source} => {translation}" for source, translation in examples)
+    return (f"[Reference Translations] (similar sentences translated before; keep terminology consistent):\n"
+            f"{references}\n\n[Source Text]: {text}\n[Translation]:")
+
+
+def segment_content(text, before="", after=""):
+    """긴 셀의 한 조각. 앞뒤 원문은 문맥으로만 주고 [Source Text]만 번역하게 한다."""
+    context = ""
+    if before:
+        context += f"[Context Before] (preceding text, do not translate): {before}\n"
+    if after:
+        context += f"[Context After] (following text, do not translate): {after}\n"
+    if context:
+        context += "Translate only the [Source Text] below; it is one part of a longer text.\n\n"
+    return f"{context}[Source Text]: {text}\n[Translation]:"
+
+
+def correction_content(content, hint, previous):
+    """검수에 걸린 번역을 다시 요청할 때, 이전 번역과 고칠 점을 원래 요청 앞에 붙인다."""
+    return (f"[Previous Translation]: {previous}\n"
+            f"[Issues Found]:\n{hint}\n"
+            f"Translate again, fixing every issue above while following all rules.\n\n{content}")
+
+
+def generate_translation(model, text):
+    response = model.generate_content(source_content(text))
+    return response.text.strip()
+
+
+def stream_translation(model, text):
+    response = model.generate_content(source_content(text), stream=True)
+    for chunk in response:
+        yield chunk.text
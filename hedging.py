@@ -0,0 +1,166 @@
+"""느린 호출 헤징(hedged request)과 대체 모델.
+
+실행 중에 잰 호출 지연 시간의 백분위수(기본 p95)가 지나도록 응답이 없으면 같은 요청을 한 번 더 보내고
+먼저 도착한 응답을 쓴다. 늦게 끝난 쪽의 응답은 버린다. 추가 호출은 전체 호출의 max_extra 비율을
+넘지 않으며, 지연 시간 표본이 min_samples개 모이기 전에는 헤징하지 않는다.
+limiter를 주면 헤지는 원래 호출과 별도로 limiter에서 자리(RPM 시각, 동시 요청 수)를 기다리지 않고 받으며,
+바로 받을 수 없으면 보내지 않는다. 진 쪽 호출도 실제로 끝날 때까지 동시 요청 한도에 잡혀 있다.
+fallback_model을 지정하면 같은 요청이 fallback_after번 이상 느리거나(헤징을 켠 경우) 실패한 뒤의
+호출(재시도나 헤지)을 그 모델로 보낸다.
+"""
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+
+from metrics import percentile
+
+
+class Hedger:
+    def __init__(self, model_name, percentile=95, max_extra=0.05, min_samples=20, min_delay=0.5,
+                 fallback_model=None, fallback_after=2, window=500, metrics=None, limiter=None):
+        self.model_name = model_name
+        self.percentile = percentile
+        self.max_extra = max_extra
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.fallback_model = fallback_model
+        self.fallback_after = fallback_after
+        self.metrics = metrics
+        self.limiter = limiter
+        self.calls = 0
+        self.hedged = 0
+        self._latencies = deque(maxlen=window)
+        self._threshold = None
+        self._observed = 0
+        self._strikes = {}
+        self._lock = threading.Lock()
+
+    def threshold(self):
+        """헤지를 보낼 대기 시간(초). 표본이 모자라면 None."""
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            # 매 호출마다 정렬하지 않도록 표본이 20개 늘 때마다 다시 계산
+            if self._threshold is None or self._observed >= 20:
+                self._threshold = max(self.min_delay, percentile(sorted(self._latencies), self.percentile))
+                self._observed = 0
+            return self._threshold
+
+    def _observe(self, seconds):
+        with self._lock:
+            self._latencies.append(seconds)
+            self._observed += 1
+
+    def _strike(self, key):
+        with self._lock:
+            self._strikes[key] = self._strikes.get(key, 0) + 1
+            if len(self._strikes) > 10000:
+                self._strikes.pop(next(iter(self._strikes)))
+
+    def _pick_model(self, key):
+        with self._lock:
+            strikes = self._strikes.get(key, 0)
+        if self.fallback_model and strikes >= self.fallback_after:
+            if self.metrics is not None:
+                self.metrics.record_fallback()
+            return self.fallback_model
+        return self.model_name
+
+    def _start(self, fn, model_name, release=None):
+        """fn(model_name)을 새 스레드에서 실행한다. release는 호출이 끝나면 반납할 limiter 자리이다."""
+        future = Future()
+        started = time.perf_counter()
+
+        def run():
+            try:
+                result = fn(model_name)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                self._observe(time.perf_counter() - started)
+                future.set_result(result)
+            finally:
+                if release is not None:
+                    release()
+
+        threading.Thread(target=run, name="hedged-call", daemon=True).start()
+        return future
+
+    def _reserve_hedge(self):
+        """추가 호출 한도와 limiter 자리를 모두 받으면 자리 반납 함수를, 아니면 None을 반환한다."""
+        with self._lock:
+            if self.hedged + 1 > self.max_extra * self.calls:
+                return None
+            release = self.limiter.try_slot() if self.limiter is not None else _release_nothing
+            if release is None:
+                return None
+            self.hedged += 1
+            return release
+
+    def call(self, fn, key=None):
+        """fn(model_name)을 호출하고 결과를 반환한다. key는 같은 요청을 알아보는 값(보통 요청 내용)이다."""
+        with self._lock:
+            self.calls += 1
+        model_name = self._pick_model(key)
+        # 헤징을 끈 경우(대체 모델만 사용)에는 별도 스레드 없이 바로 호출
+        delay = self.threshold() if self.max_extra else None
+        if delay is None:
+            started = time.perf_counter()
+            try:
+                result = fn(model_name)
+            except Exception:
+                self._strike(key)
+                raise
+            self._observe(time.perf_counter() - started)
+            self._forget(key)
+            return result
+
+        primary = self._start(fn, model_name)
+        wait([primary], timeout=delay)
+        if not primary.done():
+            self._strike(key)
+            release = self._reserve_hedge()
+            if release is not None:
+                return self._race(primary, self._start(fn, self._pick_model(key), release), key)
+            if self.metrics is not None:
+                self.metrics.record_hedge(skipped=True)
+        try:
+            result = primary.result()
+        except Exception:
+            self._strike(key)
+            raise
+        self._forget(key)
+        return result
+
+    def _race(self, primary, hedge, key):
+        pending = {primary, hedge}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if self.metrics is not None:
+                        self.metrics.record_hedge(won=future is hedge)
+                    if future is hedge and not primary.done():
+                        self._hold_until_done(primary)
+                    self._forget(key)
+                    return future.result()
+                error = error or future.exception()
+        self._strike(key)
+        raise error
+
+    def _hold_until_done(self, primary):
+        # 원래 호출은 호출한 쪽의 limiter 자리로 실행 중이었다. 그 자리는 여기서 돌아가면 반납되므로
+        # 반납 전에 따로 하나를 잡아 두고, 버려진 호출이 실제로 끝날 때 놓는다
+        if self.limiter is not None:
+            release = self.limiter.hold()
+            primary.add_done_callback(lambda _: release())
+
+    def _forget(self, key):
+        with self._lock:
+            self._strikes.pop(key, None)
+
+
+def _release_nothing():
+    pass
@@ -0,0 +1,114 @@
+"""Streamlit 스크립트 스레드와 분리된 백그라운드 번역 작업 실행기.
+
+프로세스 전체에서 하나의 실행기를 공유하며, 동시에 실행하는 작업 수만 정한다. API 예산(동시 요청 수와 RPM)은
+각 작업의 Translator가 쓰는 API 키별 스케줄러(scheduler.get_scheduler)가 나눠 준다.
+UI는 작업의 진행률/처리량/ETA를 조회(polling)만 한다.
+완료된 결과 파일(xlsx/csv)은 디스크에 저장되어 나중에 작업 목록에서 내려받을 수 있다.
+"""
+import os
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_ARTIFACT_DIR = os.path.join(".translation_cache", "artifacts")
+
+
+class BackgroundJob:
+    def __init__(self, name):
+        self.job_id = uuid.uuid4().hex[:12]
+        self.name = name
+        self.status = "queued"
+        self.total = 0
+        self.done = 0
+        self.error = None
+        self.artifact_path = None
+        self.artifact_name = None
+        self.message = ""
+        self.metrics = None
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+
+    def progress(self, done, total):
+        self.done = done
+        self.total = total
+
+    @property
+    def elapsed(self):
+        if not self.started:
+            return 0.0
+        return (self.finished or time.time()) - self.started
+
+    @property
+    def throughput(self):
+        return self.done / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def eta(self):
+        if self.status != "running" or not self.throughput:
+            return None
+        return (self.total - self.done) / self.throughput
+
+    def read_artifact(self):
+        if not self.artifact_path or not os.path.exists(self.artifact_path):
+            return None
+        with open(self.artifact_path, "rb") as f:
+            return f.read()
+
+
+class JobRunner:
+    def __init__(self, max_jobs=2, artifact_dir=DEFAULT_ARTIFACT_DIR):
+        os.makedirs(artifact_dir, exist_ok=True)
+        self.artifact_dir = artifact_dir
+        self._executor = ThreadPoolExecutor(max_workers=max_jobs, thread_name_prefix="translation-job")
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, name, job_fn):
+        """job_fn(job)을 백그라운드에서 실행한다.
+
+        job_fn은 job.progress(done, total)로 진행 상황을 알리고, 결과 파일이 있으면
+        (파일 이름, bytes) 또는 (파일 이름, 임시 파일 경로)를 반환한다.
+        """
+        job = BackgroundJob(name)
+        with self._lock:
+            self._jobs[job.job_id] = job
+        self._executor.submit(self._run, job, job_fn)
+        return job
+
+    def _run(self, job, job_fn):
+        job.status = "running"
+        job.started = time.time()
+        try:
+            artifact = job_fn(job)
+            if artifact:
+                file_name, data = artifact
+                path = os.path.join(self.artifact_dir, f"{job.job_id}_{file_name}")
+                if isinstance(data, str):
+                    shutil.move(data, path)
+                else:
+                    with open(path, "wb") as f:
+                        f.write(data)
+                job.artifact_path = path
+                job.artifact_name = file_name
+            job.status = "done"
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            job.finished = time.time()
+
+    def has_active(self):
+        """대기 중이거나 실행 중인 작업이 있는지 (UI 자동 갱신 여부 판단용)."""
+        with self._lock:
+            return any(job.status in ("queued", "running") for job in self._jobs.values())
+
+    def jobs(self):
+        with self._lock:
+            return sorted(self._jobs.values(), key=lambda job: job.submitted, reverse=True)
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
@@ -0,0 +1,156 @@
+"""체크포인트 기반 번역 작업 저장소.
+
+배치 번역을 안정적인 job ID를 가진 작업으로 만들고, 완료된 행을 로컬 SQLite에 바로 기록한다.
+Streamlit이 재실행되거나 앱이 죽어도 "작업 이어하기"로 남은 행만 다시 번역할 수 있다.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_PATH = os.path.join(".translation_cache", "jobs.sqlite3")
+
+
+def make_job_id(source_id, *settings):
+    """원본(파일 해시/시트 ID)과 번역 설정으로 항상 같은 job ID를 만든다."""
+    raw = "\x1f".join([str(source_id)] + [str(value) for value in settings])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def file_fingerprint(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def path_fingerprint(path, block_size=1 << 20):
+    """file_fingerprint와 같은 값을 파일 전체를 메모리에 올리지 않고 계산한다."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class JobStore:
+    def __init__(self, path=DEFAULT_PATH):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                name TEXT,
+                total INTEGER,
+                status TEXT,
+                created REAL,
+                updated REAL
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS job_rows (
+                job_id TEXT,
+                row_index INTEGER,
+                translation TEXT,
+                PRIMARY KEY (job_id, row_index)
+            )
+        """)
+        self._conn.commit()
+
+    def start(self, job_id, name, total, resume=False):
+        now = time.time()
+        with self._lock:
+            if not resume:
+                self._conn.execute("DELETE FROM job_rows WHERE job_id = ?", (job_id,))
+            self._conn.execute(
+                "INSERT INTO jobs VALUES (?, ?, ?, 'running', ?, ?) "
+                "ON CONFLICT(job_id) DO UPDATE SET name = excluded.name, total = excluded.total, "
+                "status = 'running', updated = excluded.updated",
+                (job_id, name, total, now, now)
+            )
+            self._conn.commit()
+
+    def save_row(self, job_id, row_index, translation):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO job_rows VALUES (?, ?, ?)",
+                (job_id, int(row_index), translation)
+            )
+            self._conn.execute("UPDATE jobs SET updated = ? WHERE job_id = ?", (time.time(), job_id))
+            self._conn.commit()
+
+    def finish(self, job_id, status="done"):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, updated = ? WHERE job_id = ?",
+                (status, time.time(), job_id)
+            )
+            self._conn.commit()
+
+    def completed_rows(self, job_id):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT row_index, translation FROM job_rows WHERE job_id = ?", (job_id,)
+            ).fetchall()
+        return dict(rows)
+
+    def get(self, job_id):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT job_id, name, total, status, created, updated FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            done = self._conn.execute(
+                "SELECT COUNT(*) FROM job_rows WHERE job_id = ?", (job_id,)
+            ).fetchone()[0]
+        keys = ["job_id", "name", "total", "status", "created", "updated"]
+        job = dict(zip(keys, row))
+        job["done"] = done
+        return job
+
+
+def run_checkpointed(store, job_id, items, run_fn, on_result=None, finish=True):
+    """체크포인트에 있는 행은 건너뛰고 나머지만 run_fn으로 번역하면서 완료 행을 바로 저장한다.
+
+    run_fn(items, on_result)은 translate_rows와 같은 형태이다. 실패한 행(translated=None)은 저장하지 않아
+    다음 이어하기에서 다시 시도된다. 한 작업을 여러 청크로 나눠 부르는 경우에는 finish=False로 행만 저장하고,
+    작업 상태(done/partial)는 호출한 쪽이 마지막에 한 번 정한다.
+    """
+    items = list(items)
+    total = len(items)
+    completed = store.completed_rows(job_id)
+    results = {}
+    done = 0
+    failed = False
+
+    def report(index, translated):
+        nonlocal done, failed
+        if translated is None:
+            failed = True
+        else:
+            results[index] = translated
+        done += 1
+        if on_result:
+            on_result(index, translated, done, total)
+
+    pending = []
+    for index, text in items:
+        if index in completed:
+            report(index, completed[index])
+        else:
+            pending.append((index, text))
+
+    def on_pending_result(index, translated, _done, _total):
+        if translated is not None:
+            store.save_row(job_id, index, translated)
+        report(index, translated)
+
+    run_fn(pending, on_pending_result)
+    if finish:
+        store.finish(job_id, status="partial" if failed else "done")
+    return results
@@ -0,0 +1,234 @@
+"""모델 호출 계측: 지연 시간, 토큰 사용량, 예상 비용.
+
+모델 호출마다 걸린 시간과 response.usage_metadata의 토큰 수를 기록하고, 작업 단위로
+p50/p95/p99 지연 시간, 초당 행/토큰 수, 예상 비용을 집계한다. 집계 결과는 JSON이나
+Prometheus 텍스트 형식(node_exporter textfile collector용)으로 내보낼 수 있다.
+"""
+import json
+import math
+import threading
+import time
+
+# 모델별 100만 토큰당 가격 (USD, 입력/출력)
+MODEL_PRICES = {
+    "gemini-2.5-flash": (0.30, 2.50),
+    "gemini-2.5-flash-lite": (0.10, 0.40),
+    "gemini-2.5-pro": (1.25, 10.00),
+}
+
+
+def usage_tokens(response):
+    """응답의 usage_metadata에서 (입력 토큰, 출력 토큰)을 꺼낸다. 없으면 (0, 0)."""
+    usage = getattr(response, "usage_metadata", None)
+    if usage is None:
+        return 0, 0
+    return (getattr(usage, "prompt_token_count", 0) or 0,
+            getattr(usage, "candidates_token_count", 0) or 0)
+
+
+def percentile(values, q):
+    """nearest-rank 방식 백분위수. values는 정렬된 목록이어야 한다."""
+    if not values:
+        return None
+    rank = max(1, math.ceil(q / 100.0 * len(values)))
+    return values[min(rank, len(values)) - 1]
+
+
+class RunMetrics:
+    def __init__(self, model_name, prices=None):
+        self.model_name = model_name
+        self.prices = prices if prices is not None else MODEL_PRICES.get(model_name)
+        self.started = time.perf_counter()
+        self.updated = self.started
+        self.latencies = []
+        self.calls = 0
+        self.errors = 0
+        self.prompt_tokens = 0
+        self.output_tokens = 0
+        # 대체 모델은 가격이 다르므로 모델별 (입력 토큰, 출력 토큰)을 따로 센다
+        self.model_tokens = {}
+        self.rows = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.hedged_calls = 0
+        self.hedge_wins = 0
+        self.hedges_skipped = 0
+        self.fallback_calls = 0
+        self._lock = threading.Lock()
+
+    def measure(self, fn, *args, **kwargs):
+        """fn을 호출하면서 걸린 시간과 토큰 수를 기록하고 응답을 그대로 반환한다."""
+        return self.measure_model(None, fn, *args, **kwargs)
+
+    def measure_model(self, model_name, fn, *args, **kwargs):
+        """measure와 같지만 토큰을 model_name(예: 대체 모델)의 사용량으로 기록한다. None이면 기본 모델."""
+        started = time.perf_counter()
+        try:
+            response = fn(*args, **kwargs)
+        except Exception:
+            self.record_call(time.perf_counter() - started, ok=False, model_name=model_name)
+            raise
+        self.record_call(time.perf_counter() - started, *usage_tokens(response), model_name=model_name)
+        return response
+
+    def record_call(self, seconds, prompt_tokens=0, output_tokens=0, ok=True, model_name=None):
+        with self._lock:
+            self.calls += 1
+            self.latencies.append(seconds)
+            self.prompt_tokens += prompt_tokens
+            self.output_tokens += output_tokens
+            model_name = model_name or self.model_name
+            prompt, output = self.model_tokens.get(model_name, (0, 0))
+            self.model_tokens[model_name] = (prompt + prompt_tokens, output + output_tokens)
+            if not ok:
+                self.errors += 1
+            self.updated = time.perf_counter()
+
+    def record_cache(self, hits, misses):
+        with self._lock:
+            self.cache_hits += hits
+            self.cache_misses += misses
+
+    def record_hedge(self, won=False, skipped=False):
+        """헤지 결과. skipped는 느렸지만 추가 호출 한도나 빈 자리(RPM/동시 요청)가 없어 헤지를 보내지 않은 경우이다."""
+        with self._lock:
+            if skipped:
+                self.hedges_skipped += 1
+                return
+            self.hedged_calls += 1
+            if won:
+                self.hedge_wins += 1
+
+    def record_fallback(self):
+        with self._lock:
+            self.fallback_calls += 1
+
+    def add_rows(self, count):
+        with self._lock:
+            self.rows += count
+            self.updated = time.perf_counter()
+
+    def estimated_cost(self):
+        """모델별 가격으로 계산한 비용. 가격을 모르는 모델을 쓴 호출이 있으면 None."""
+        with self._lock:
+            model_tokens = dict(self.model_tokens)
+        if not model_tokens:
+            return 0.0 if self.prices else None
+        cost = 0.0
+        for model_name, (prompt_tokens, output_tokens) in model_tokens.items():
+            prices = self.prices if model_name == self.model_name else MODEL_PRICES.get(model_name)
+            if not prices:
+                return None
+            cost += prompt_tokens * prices[0] + output_tokens * prices[1]
+        return cost / 1_000_000
+
+    def summary(self, controller=None):
+        """집계 결과를 딕셔너리로 반환한다. controller를 넘기면 재시도/429/실패 행 수도 함께 담는다."""
+        cost = self.estimated_cost()
+        with self._lock:
+            latencies = sorted(self.latencies)
+            elapsed = max(self.updated - self.started, 1e-9)
+            tokens = self.prompt_tokens + self.output_tokens
+            summary = {
+                "model": self.model_name,
+                "elapsed_seconds": round(elapsed, 3),
+                "calls": self.calls,
+                "errors": self.errors,
+                "latency_p50": percentile(latencies, 50),
+                "latency_p95": percentile(latencies, 95),
+                "latency_p99": percentile(latencies, 99),
+                "rows": self.rows,
+                "rows_per_second": self.rows / elapsed,
+                "prompt_tokens": self.prompt_tokens,
+                "output_tokens": self.output_tokens,
+                "tokens_per_second": tokens / elapsed,
+                "model_tokens": {model_name: {"prompt_tokens": prompt, "output_tokens": output}
+                                 for model_name, (prompt, output) in self.model_tokens.items()},
+                "cache_hits": self.cache_hits,
+                "cache_misses": self.cache_misses,
+                "estimated_cost_usd": cost,
+                "hedged_calls": self.hedged_calls,
+                "hedge_wins": self.hedge_wins,
+                "hedges_skipped": self.hedges_skipped,
+                "fallback_calls": self.fallback_calls,
+            }
+        if controller is not None:
+            stats = controller.snapshot()
+            summary["retries"] = stats["retries"]
+            summary["rate_limited"] = stats["rate_limited"]
+            summary["failed_rows"] = stats["failed_rows"]
+        return summary
+
+
+def to_json(summary):
+    return json.dumps(summary, ensure_ascii=False, indent=2)
+
+
+def _label_text(labels):
+    if not labels:
+        return ""
+    parts = []
+    for key, value in sorted(labels.items()):
+        value = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        parts.append(f'{key}="{value}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def to_prometheus(summary, labels=None):
+    """summary를 Prometheus 텍스트 노출 형식으로 변환한다."""
+    labels = dict(labels or {})
+    labels.setdefault("model", summary["model"])
+    lines = []
+
+    def metric(name, kind, help_text, samples):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for extra, value in samples:
+            if value is not None:
+                lines.append(f"{name}{_label_text({**labels, **extra})} {value}")
+
+    metric("translation_calls_total", "counter", "Model calls by outcome.",
+           [({"status": "ok"}, summary["calls"] - summary["errors"]),
+            ({"status": "error"}, summary["errors"])])
+    metric("translation_call_latency_seconds", "summary", "Model call wall time.",
+           [({"quantile": "0.5"}, summary["latency_p50"]),
+            ({"quantile": "0.95"}, summary["latency_p95"]),
+            ({"quantile": "0.99"}, summary["latency_p99"])])
+    model_tokens = summary.get("model_tokens") or {
+        labels["model"]: {"prompt_tokens": summary["prompt_tokens"], "output_tokens": summary["output_tokens"]}
+    }
+    metric("translation_tokens_total", "counter", "Tokens reported by usage metadata.",
+           [({"model": model_name, "type": kind}, tokens[f"{kind}_tokens"])
+            for model_name, tokens in sorted(model_tokens.items()) for kind in ("prompt", "output")])
+    metric("translation_rows_total", "counter", "Rows translated.", [({}, summary["rows"])])
+    metric("translation_rows_per_second", "gauge", "Rows translated per second.",
+           [({}, round(summary["rows_per_second"], 3))])
+    metric("translation_tokens_per_second", "gauge", "Tokens processed per second.",
+           [({}, round(summary["tokens_per_second"], 3))])
+    metric("translation_cache_lookups_total", "counter", "Translation memory lookups by result.",
+           [({"result": "hit"}, summary["cache_hits"]),
+            ({"result": "miss"}, summary["cache_misses"])])
+    metric("translation_estimated_cost_usd", "gauge", "Estimated cost from token usage.",
+           [({}, summary["estimated_cost_usd"])])
+    if "hedged_calls" in summary:
+        metric("translation_hedged_calls_total", "counter", "Duplicate calls sent for slow requests by winner.",
+               [({"winner": "hedge"}, summary["hedge_wins"]),
+                ({"winner": "primary"}, summary["hedged_calls"] - summary["hedge_wins"])])
+        metric("translation_hedges_skipped_total", "counter", "Slow calls not hedged because of the extra-call cap or quota.",
+               [({}, summary["hedges_skipped"])])
+        metric("translation_fallback_calls_total", "counter", "Calls sent to the fallback model.",
+               [({}, summary["fallback_calls"])])
+    if "retries" in summary:
+        metric("translation_retries_total", "counter", "Retried model calls.", [({}, summary["retries"])])
+        metric("translation_rate_limited_total", "counter", "Calls rejected with 429.",
+               [({}, summary["rate_limited"])])
+        metric("translation_failed_rows", "gauge", "Rows that failed after all retries.",
+               [({}, summary["failed_rows"])])
+    return "\n".join(lines) + "\n"
+
+
+def write_metrics(path, summary, labels=None):
+    """확장자가 .prom이면 Prometheus 텍스트, 그 밖에는 JSON으로 저장한다."""
+    text = to_prometheus(summary, labels) if path.endswith(".prom") else to_json(summary)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
@@ -0,0 +1,112 @@
+"""여러 워크시트 / 여러 컬럼 쌍을 한 작업으로 번역.
+
+작업 명세는 한 줄에 "시트 이름: 원문열->대상열, 원문열->대상열" 형식이며 시트 이름 `*`는 모든 워크시트를 뜻한다.
+
+    Sheet1: D->E, F->G
+    * : B->C
+
+시트마다 필요한 컬럼만 batch_get 한 번으로 읽고, 모든 셀을 하나의 작업 큐로 모아 공유 워커 풀에 넘긴다.
+같은 원문은 시트/컬럼이 달라도 한 번만 번역되며(번역 메모리 계층의 중복 제거), 결과는 시트마다
+ChunkedSheetWriter 하나로 모아 여러 컬럼을 한 번의 batch_update로 저장한다.
+"""
+import hashlib
+from collections import namedtuple
+
+from sheets_io import ChunkedSheetWriter, column_index, column_letter, read_columns
+
+SheetCell = namedtuple("SheetCell", ["sheet", "source_col", "target_col", "row", "text", "target_text"])
+
+ALL_SHEETS = "*"
+
+
+def parse_job_spec(text):
+    """작업 명세를 [(시트 이름, 원문 컬럼 번호, 대상 컬럼 번호)] 목록으로 바꾼다. 형식이 틀리면 ValueError."""
+    tasks = []
+    for line_no, line in enumerate(text.splitlines(), 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        sheet, separator, pairs = line.rpartition(":")
+        if not separator or not sheet.strip():
+            raise ValueError(f"{line_no}번째 줄: '시트 이름: 원문열->대상열' 형식이어야 합니다")
+        for pair in pairs.split(","):
+            source, arrow, target = pair.partition("->")
+            if not arrow:
+                raise ValueError(f"{line_no}번째 줄: '{pair.strip()}'는 '원문열->대상열' 형식이어야 합니다")
+            task = (sheet.strip(), column_index(source), column_index(target))
+            if task not in tasks:
+                tasks.append(task)
+    if not tasks:
+        raise ValueError("번역할 시트/컬럼이 없습니다")
+    return tasks
+
+
+def describe_tasks(tasks):
+    return ", ".join(f"{sheet}: {column_letter(source)}->{column_letter(target)}" for sheet, source, target in tasks)
+
+
+def gather_cells(spreadsheet, tasks):
+    """명세에 있는 모든 원문 셀을 모아 (SheetCell 목록, {시트 이름: 워크시트})를 반환한다."""
+    worksheets = {worksheet.title: worksheet for worksheet in spreadsheet.worksheets()}
+    pairs_by_sheet = {}
+    for sheet, source, target in tasks:
+        titles = list(worksheets) if sheet == ALL_SHEETS else [sheet]
+        for title in titles:
+            if title not in worksheets:
+                raise ValueError(f"시트를 찾을 수 없습니다: {title}")
+            pairs = pairs_by_sheet.setdefault(title, [])
+            if (source, target) not in pairs:
+                pairs.append((source, target))
+
+    cells = []
+    for title, pairs in pairs_by_sheet.items():
+        indices = sorted({index for pair in pairs for index in pair})
+        _, columns = read_columns(worksheets[title], indices)
+        column_of = dict(zip(indices, columns))
+        for source, target in pairs:
+            for row, value in enumerate(column_of[source]):
+                text = "" if value is None else str(value)
+                if text.strip():
+                    cells.append(SheetCell(title, source, target, row, text, str(column_of[target][row] or "")))
+    return cells, {title: worksheets[title] for title in pairs_by_sheet}
+
+
+def cell_key(cell):
+    """시트 이름, 대상 컬럼, 행으로 정해지는 셀 고유 번호 (SQLite 정수 범위).
+
+    체크포인트와 결과를 셀 목록의 순번이 아니라 이 번호로 저장하므로, Delta 모드로 일부 셀이 빠져
+    순번이 달라져도 이어하기가 엉뚱한 셀에 쓰지 않는다.
+    """
+    digest = hashlib.sha1(f"{cell.sheet}\0{cell.target_col}\0{cell.row}".encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") >> 1
+
+
+def describe_cell(cell):
+    return f"{cell.sheet} {column_letter(cell.target_col)}{cell.row + 2}"
+
+
+def make_writers(worksheets, chunk_size=200):
+    return {title: ChunkedSheetWriter(worksheet, chunk_size=chunk_size) for title, worksheet in worksheets.items()}
+
+
+def translate_cells(cells, run_fn, writers=None, on_result=None):
+    """모든 셀을 한 번의 run_fn 호출로 번역하고, 결과를 시트별 writer에 모아 저장한다.
+
+    run_fn(items, on_result)은 pipeline.Translator.run과 같은 형태이며 행 번호 대신 cell_key(셀)를 받는다.
+    on_result(cell, translated, done, total)는 셀마다 호출된다. 반환값은 {cell_key(셀): 번역}이다.
+    """
+    by_key = {cell_key(cell): cell for cell in cells}
+    items = [(key, cell.text) for key, cell in by_key.items()]
+
+    def on_cell_result(key, translated, done, total):
+        cell = by_key[key]
+        if translated is not None and writers:
+            writers[cell.sheet].add_cell(cell.row, cell.target_col, translated)
+        if on_result:
+            on_result(cell, translated, done, total)
+
+    try:
+        return run_fn(items, on_cell_result)
+    finally:
+        for writer in (writers or {}).values():
+            writer.close()
@@ -0,0 +1,225 @@
+"""Streamlit 없이 쓸 수 있는 번역 파이프라인.
+
+프롬프트 생성, 모델 호출, 번역 메모리, 체크포인트를 Translator 하나로 묶는다.
+app.py(Streamlit)와 cli.py(명령줄)가 같은 코드를 공유하며, 이 모듈은 streamlit이나 pandas를
+불러오지 않으므로 cron이나 다른 파이프라인에서 가볍게 import할 수 있다.
+"""
+from batching import translate_rows_batched
+from engine import RateLimiter, translate_rows
+from gemini_client import MODEL_NAME, GeminiBackend, correction_content, segment_content, source_content
+from hedging import Hedger
+from job_store import run_checkpointed
+from metrics import RunMetrics
+from prompts import build_master_prompt
+from rate_control import AdaptiveController
+from segmentation import Segment, translate_segmented
+from spreadsheet_io import stream_translate_file
+from translation_memory import prompt_version, translate_with_memory
+from validation import Correction, ValidationReport, translate_validated
+
+
+def collect_items(df, idx_src):
+    """DataFrame의 원문 컬럼에서 번역할 (행 번호, 원문) 목록을 추출한다."""
+    import pandas as pd
+
+    items = []
+    if idx_src >= len(df.columns):
+        return items
+    for index in range(len(df)):
+        value = df.iat[index, idx_src]
+        source_text = str(value) if pd.notna(value) else ""
+        if source_text.strip():
+            items.append((index, source_text))
+    return items
+
+
+class Translator:
+    """한 번의 설정(API 키, 카테고리, 레벨, 모드)으로 행 목록이나 파일을 번역한다.
+
+    limiter를 넘기면 여러 Translator(예: 동시에 처리하는 여러 파일)가 같은 분당 요청 한도를 나눠 쓴다.
+    backend를 넘기지 않으면 GeminiBackend(genai_module)를 쓴다.
+    hedge=True이면 실행 중 p{hedge_percentile} 지연을 넘긴 호출에 같은 요청을 한 번 더 보내고(추가 호출은
+    전체의 hedge_max_extra 이하), fallback_model을 주면 거듭 느리거나 실패한 요청을 그 모델로 보낸다.
+    """
+
+    def __init__(self, api_key, category, level, max_workers=8, rpm=60, limiter=None,
+                 batch_mode=False, batch_rows=30, batch_token_budget=3000,
+                 memory=None, fuzzy=None, fuzzy_threshold=0.8, job_store=None, model_name=MODEL_NAME,
+                 genai_module=None, segment_chars=1500, context_chars=200, validate=True, backend=None,
+                 hedge=False, hedge_percentile=95, hedge_max_extra=0.05, fallback_model=None):
+        self.api_key = api_key
+        self.category = category
+        self.level = level
+        self.max_workers = max_workers
+        self.limiter = limiter or RateLimiter(rpm)
+        self.batch_mode = batch_mode
+        self.batch_rows = batch_rows
+        self.batch_token_budget = batch_token_budget
+        self.memory = memory
+        self.fuzzy = fuzzy
+        self.fuzzy_threshold = fuzzy_threshold
+        self.job_store = job_store
+        self.segment_chars = segment_chars
+        self.context_chars = context_chars
+        self.validate = validate
+        self.validation = ValidationReport()
+        self.model_name = model_name
+        self.backend = backend or GeminiBackend(genai_module)
+        self.system_prompt = build_master_prompt(category, level)
+        self.prompt_hash = prompt_version(self.system_prompt)
+        self.metrics = RunMetrics(model_name)
+        self.hedger = None
+        if hedge or fallback_model:
+            self.hedger = Hedger(model_name, percentile=hedge_percentile,
+                                 max_extra=hedge_max_extra if hedge else 0.0,
+                                 fallback_model=fallback_model, metrics=self.metrics, limiter=self.limiter)
+        if memory is not None:
+            memory.purge_stale(category, level, model_name, self.prompt_hash)
+        if fuzzy is not None:
+            fuzzy.purge_stale(category, level, model_name, self.prompt_hash)
+
+    def _model(self, model_name=None):
+        return self.backend.model(self.api_key, self.system_prompt, model_name or self.model_name)
+
+    def _generate(self, contents, **kwargs):
+        # 호출마다 걸린 시간과 토큰 수를 모델별로 self.metrics에 기록 (대체 모델은 가격이 다름)
+        def send(model_name):
+            return self.metrics.measure_model(model_name, self._model(model_name).generate_content,
+                                              contents, **kwargs)
+
+        if self.hedger is None:
+            return send(self.model_name)
+        return self.hedger.call(send, key=contents)
+
+    def near_matches(self, text, limit=3):
+        """유사 문장 색인에서 (유사도, 원문, 번역) 목록을 찾는다. fuzzy가 없으면 빈 목록."""
+        if self.fuzzy is None:
+            return []
+        return self.fuzzy.near_matches(text, self.category, self.level, self.model_name, self.prompt_hash,
+                                       threshold=self.fuzzy_threshold, limit=limit)
+
+    def _content(self, value):
+        # 긴 셀의 조각(Segment)은 앞뒤 문맥과 함께, 일반 행은 유사 문장 번역을 참고 예시로 붙여 보낸다
+        if isinstance(value, Correction):
+            return correction_content(self._content(value.value), value.hint, value.previous)
+        if isinstance(value, Segment):
+            return segment_content(value.text, value.before, value.after)
+        examples = [(source, translation) for _, source, translation in self.near_matches(value, limit=2)]
+        return source_content(value, examples)
+
+    def translate_text(self, text):
+        """실패 시 예외를 그대로 올려 재시도 제어기가 분류하도록 한다."""
+        return self._generate(self._content(text)).text.strip()
+
+    def translate_batch_raw(self, batch_prompt):
+        response = self._generate(
+            batch_prompt,
+            generation_config={"response_mime_type": "application/json"}
+        )
+        return response.text
+
+    def new_controller(self):
+        return AdaptiveController(self.max_workers, self.limiter)
+
+    def _run_rows(self, items, on_result, controller):
+        items = list(items)
+        if self.batch_mode:
+            # 긴 셀의 조각과 재번역 요청은 배치에 섞지 않고 한 건씩 요청
+            segments = [item for item in items if not isinstance(item[1], str)]
+            rows = [item for item in items if isinstance(item[1], str)]
+            results = translate_rows_batched(
+                rows, self.translate_batch_raw, self.translate_text,
+                token_budget=self.batch_token_budget, max_rows=self.batch_rows,
+                max_workers=self.max_workers, on_result=on_result, controller=controller
+            )
+            if segments:
+                results.update(translate_rows(
+                    segments, self.translate_text,
+                    max_workers=self.max_workers, on_result=on_result, controller=controller
+                ))
+            return results
+        return translate_rows(
+            items, self.translate_text,
+            max_workers=self.max_workers, on_result=on_result, controller=controller
+        )
+
+    def _run_checked(self, items, on_result, controller):
+        if not self.validate:
+            return self._run_rows(items, on_result, controller)
+        return translate_validated(
+            items, lambda rows, cb: self._run_rows(rows, cb, controller),
+            self.validation, on_result=on_result
+        )
+
+    def _run_model(self, items, on_result, controller):
+        if not self.segment_chars:
+            return self._run_checked(items, on_result, controller)
+        results = translate_segmented(
+            items, lambda rows, cb: self._run_checked(rows, cb, controller),
+            self.segment_chars, self.context_chars, on_result=on_result
+        )
+        controller.rekey_failures(lambda key: key[0] if isinstance(key, tuple) else key)
+        return results
+
+    def _run_with_memory(self, items, on_result, controller):
+        items = list(items)
+        sent = 0
+
+        def run_pending(rows, cb):
+            nonlocal sent
+            sent += len(rows)
+            return self._run_model(rows, cb, controller)
+
+        results = translate_with_memory(
+            items, run_pending,
+            self.memory, self.category, self.level, self.model_name, self.prompt_hash,
+            on_result=on_result, fuzzy=self.fuzzy
+        )
+        # 메모리 적중과 실행 중 중복 제거로 모델까지 가지 않은 행은 캐시 적중으로 센다
+        self.metrics.record_cache(len(items) - sent, sent)
+        return results
+
+    def run(self, items, on_result=None, controller=None, job_id=None, job_name="",
+            resume=False, total=None, finish=True):
+        """(행 번호, 원문) 목록을 번역해서 {행 번호: 번역}을 반환한다.
+
+        job_id가 있고 job_store가 설정되어 있으면 완료한 행을 체크포인트에 저장하며 진행한다.
+        finish=False이면 작업 상태는 바꾸지 않는다 (청크 단위 번역에서 마지막에 한 번 정함).
+        """
+        controller = controller or self.new_controller()
+        if not job_id or self.job_store is None:
+            results = self._run_with_memory(items, on_result, controller)
+        else:
+            self.job_store.start(job_id, job_name, len(items) if total is None else total, resume=resume)
+            results = run_checkpointed(
+                self.job_store, job_id, items,
+                lambda pending, cb: self._run_with_memory(pending, cb, controller),
+                on_result=on_result, finish=finish
+            )
+        self.metrics.add_rows(len(results))
+        return results
+
+    def translate_file(self, src_path, idx_src, idx_tgt, target_header, out_path=None,
+                       controller=None, job_id=None, resume=False, chunk_size=2000,
+                       on_progress=None, skip_row=None):
+        """xlsx/csv 파일을 청크 단위로 번역해서 out_path에 쓰고 경로를 반환한다."""
+        controller = controller or self.new_controller()
+        is_csv = str(src_path).lower().endswith(".csv")
+        if job_id and self.job_store is not None and not resume:
+            self.job_store.start(job_id, str(src_path), 0)
+        sent = 0
+
+        def translate_chunk(chunk_items):
+            nonlocal sent
+            sent += len(chunk_items)
+            return self.run(chunk_items, None, controller, job_id=job_id,
+                            job_name=str(src_path), resume=True, total=sent, finish=False)
+
+        out_path = stream_translate_file(
+            src_path, is_csv, idx_src, idx_tgt, target_header, translate_chunk,
+            chunk_size=chunk_size, out_path=out_path, on_progress=on_progress, skip_row=skip_row
+        )
+        # 한 청크의 실패가 다음 청크의 완료로 덮이지 않도록 파일 전체가 끝난 뒤 한 번만 상태를 정함
+        if job_id and self.job_store is not None:
+            self.job_store.finish(job_id, status="partial" if controller.failures else "done")
+        return out_path
@@ -0,0 +1,162 @@
+"""적응형 호출 제어: 오류 분류, 지터 지수 백오프, AIMD 동시성 조절.
+
+429(할당량 초과)를 받으면 동시 요청 수를 절반으로 줄이고, 연속으로 성공하면 하나씩 늘린다.
+일시적 오류(5xx, 타임아웃)는 백오프 후 재시도하고, 영구 오류(잘못된 요청, 인증 실패)는 바로 실패 처리한다.
+재시도를 모두 써도 실패한 행은 셀에 "Error:" 문자열을 쓰는 대신 실패 목록에 남는다.
+"""
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+RATE_LIMIT = "rate_limit"
+TRANSIENT = "transient"
+PERMANENT = "permanent"
+
+_RATE_LIMIT_NAMES = {"ResourceExhausted", "TooManyRequests"}
+_TRANSIENT_NAMES = {
+    "ServiceUnavailable", "InternalServerError", "DeadlineExceeded", "GatewayTimeout",
+    "BadGateway", "Aborted", "Unknown", "RetryError",
+}
+
+
+class TranslationFailed(Exception):
+    def __init__(self, kind, error):
+        super().__init__(f"{kind}: {error}")
+        self.kind = kind
+        self.error = error
+
+
+def classify_error(error):
+    """예외를 RATE_LIMIT / TRANSIENT / PERMANENT 중 하나로 분류한다."""
+    code = getattr(error, "code", None)
+    if not isinstance(code, int):
+        code = getattr(error, "status_code", None)
+    name = type(error).__name__
+    message = str(error).lower()
+
+    if code == 429 or name in _RATE_LIMIT_NAMES or "429" in message or "quota" in message \
+            or "rate limit" in message:
+        return RATE_LIMIT
+    if (isinstance(code, int) and code >= 500) or name in _TRANSIENT_NAMES \
+            or isinstance(error, (TimeoutError, ConnectionError)) \
+            or "timeout" in message or "timed out" in message or "503" in message:
+        return TRANSIENT
+    return PERMANENT
+
+
+def backoff_delay(attempt, base=1.0, cap=60.0):
+    """Full jitter 지수 백오프: 0 ~ min(cap, base * 2^attempt) 사이의 임의 지연."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class AdaptiveController:
+    def __init__(self, max_concurrency, limiter=None, min_concurrency=1, base_delay=1.0, max_delay=60.0):
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.limit = self.max_concurrency
+        self.limiter = limiter
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.in_flight = 0
+        self.successes = 0
+        self.rate_limited = 0
+        self.transient_errors = 0
+        self.permanent_errors = 0
+        self.retries = 0
+        self.failures = {}
+        self._streak = 0
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+    @contextmanager
+    def slot(self):
+        with self._cond:
+            while self.in_flight >= self.limit:
+                self._cond.wait()
+            self.in_flight += 1
+        try:
+            # 스케줄러 레인(LaneLimiter)은 호출이 끝날 때까지 자리를 잡고, RateLimiter는 간격만 맞춘다
+            if hasattr(self.limiter, "slot"):
+                with self.limiter.slot():
+                    yield
+            else:
+                if self.limiter:
+                    self.limiter.acquire()
+                yield
+        finally:
+            with self._cond:
+                self.in_flight -= 1
+                self._cond.notify_all()
+
+    def on_success(self):
+        with self._cond:
+            self.successes += 1
+            self._streak += 1
+            # 현재 동시성만큼 연속 성공하면 하나 늘림 (additive increase)
+            if self._streak >= self.limit and self.limit < self.max_concurrency:
+                self.limit += 1
+                self._streak = 0
+                self._cond.notify_all()
+
+    def on_rate_limit(self):
+        with self._cond:
+            self.rate_limited += 1
+            self._streak = 0
+            # 동시에 들어온 429가 여러 번 줄이지 않도록 잠시 간격을 둔다 (multiplicative decrease)
+            now = time.monotonic()
+            if now - self._last_decrease >= self.base_delay:
+                self.limit = max(self.min_concurrency, self.limit // 2)
+                self._last_decrease = now
+
+    def call(self, fn, *args, attempts=3):
+        """fn(*args)를 재시도와 함께 호출한다. 끝내 실패하면 TranslationFailed를 던진다."""
+        kind, error = PERMANENT, None
+        for attempt in range(attempts):
+            with self.slot():
+                try:
+                    result = fn(*args)
+                except Exception as e:
+                    kind, error = classify_error(e), e
+                else:
+                    self.on_success()
+                    return result
+
+            if kind == PERMANENT:
+                with self._cond:
+                    self.permanent_errors += 1
+                raise TranslationFailed(kind, error)
+            if kind == RATE_LIMIT:
+                self.on_rate_limit()
+            else:
+                with self._cond:
+                    self.transient_errors += 1
+            if attempt < attempts - 1:
+                with self._cond:
+                    self.retries += 1
+                time.sleep(backoff_delay(attempt, self.base_delay, self.max_delay))
+        raise TranslationFailed(kind, error)
+
+    def record_failure(self, index, failure):
+        with self._cond:
+            self.failures[index] = str(failure)
+
+    def rekey_failures(self, key_fn):
+        """실패 목록의 키를 바꾼다 (예: 조각 단위 키를 행 번호로 합치기)."""
+        with self._cond:
+            failures = {}
+            for key, reason in self.failures.items():
+                failures.setdefault(key_fn(key), reason)
+            self.failures = failures
+
+    def snapshot(self):
+        with self._cond:
+            return {
+                "concurrency": self.limit,
+                "successes": self.successes,
+                "rate_limited": self.rate_limited,
+                "transient_errors": self.transient_errors,
+                "permanent_errors": self.permanent_errors,
+                "retries": self.retries,
+                "failed_rows": len(self.failures),
+            }
@@ -0,0 +1,158 @@
+"""API 키별 전역 요청 스케줄러 (우선순위 레인).
+
+같은 API 키를 쓰는 모든 Streamlit 세션과 백그라운드 작업이 하나의 동시 요청 한도와 RPM 예산을 나눠 쓴다.
+실시간 번역(interactive)은 배치 작업(batch)보다 먼저 자리를 받고, 배치 작업은 동시 요청 한도에서
+interactive용 자리를 남겨 두므로 큰 시트가 돌고 있어도 실시간 요청이 배치 행 뒤에 줄 서지 않는다.
+RPM 간격도 미리 예약하지 않고 요청이 실제로 시작할 때 레인 우선순위대로 나눠 준다.
+레인별 대기 시간은 snapshot()으로 조회한다.
+"""
+import hashlib
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from metrics import percentile
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+LANES = (INTERACTIVE, BATCH)
+
+
+class QuotaScheduler:
+    def __init__(self, max_concurrency=16, rpm=60, interactive_reserve=1):
+        self._cond = threading.Condition()
+        self._next_slot = 0.0
+        self.waiting = {lane: 0 for lane in LANES}
+        self.in_flight = {lane: 0 for lane in LANES}
+        self.served = {lane: 0 for lane in LANES}
+        self._waits = {lane: deque(maxlen=1000) for lane in LANES}
+        self.set_limits(max_concurrency, rpm, interactive_reserve)
+
+    def set_limits(self, max_concurrency, rpm, interactive_reserve=1):
+        with self._cond:
+            self.max_concurrency = max(1, max_concurrency)
+            # 한도가 1이면 남겨 둘 자리가 없으므로 우선순위만 적용
+            self.interactive_reserve = min(interactive_reserve, self.max_concurrency - 1)
+            self.rpm = rpm
+            self._interval = 60.0 / rpm if rpm and rpm > 0 else 0.0
+            self._cond.notify_all()
+
+    def _can_start(self, lane, now):
+        # 다음 RPM 시각이 되기 전에는 어느 레인도 시작하지 않음 (앞으로의 시각을 미리 잡아 두지 않는다)
+        if now < self._next_slot:
+            return False
+        total = sum(self.in_flight.values())
+        if lane == INTERACTIVE:
+            return total < self.max_concurrency
+        # 배치는 interactive 대기자가 없고, interactive용 자리를 남겨 둘 수 있을 때만 시작
+        return not self.waiting[INTERACTIVE] and total < self.max_concurrency - self.interactive_reserve
+
+    @contextmanager
+    def slot(self, lane=BATCH):
+        """lane 우선순위에 따라 자리와 RPM 시각을 받아 호출을 실행한다.
+
+        RPM 시각은 자리를 받는 순간 실제 시작 시각으로만 나눠 주므로, 먼저 줄 선 배치 요청이 앞으로의
+        시각을 예약해 두고 잠드는 일이 없고 interactive 요청은 다음 시각을 먼저 받는다.
+        """
+        queued = time.perf_counter()
+        with self._cond:
+            self.waiting[lane] += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    if self._can_start(lane, now):
+                        break
+                    # RPM 간격이 남았으면 그 시각에 다시 확인, 아니면 자리가 날 때까지 대기
+                    self._cond.wait(self._next_slot - now if self._next_slot > now else None)
+            finally:
+                self.waiting[lane] -= 1
+            self._take(lane, now, queued)
+        try:
+            yield
+        finally:
+            self._release(lane)
+
+    def _take(self, lane, now, queued):
+        self.in_flight[lane] += 1
+        self._next_slot = now + self._interval
+        self._waits[lane].append(time.perf_counter() - queued)
+        self.served[lane] += 1
+        # interactive 대기자가 줄었으면 배치 대기자가 다시 확인해야 한다
+        self._cond.notify_all()
+
+    def _release(self, lane):
+        with self._cond:
+            self.in_flight[lane] -= 1
+            self._cond.notify_all()
+
+    def try_slot(self, lane=BATCH):
+        """기다리지 않고 자리와 RPM 시각을 받는다. 받았으면 반납 함수를, 아니면 None을 반환한다.
+
+        헤지처럼 건너뛰어도 되는 추가 호출용이며, 같은 레인에 줄 서 있는 요청을 앞지르지 않는다.
+        """
+        with self._cond:
+            now = time.monotonic()
+            if self.waiting[lane] or not self._can_start(lane, now):
+                return None
+            self._take(lane, now, time.perf_counter())
+        return lambda: self._release(lane)
+
+    def hold(self, lane=BATCH):
+        """기다리지 않고 실행 중 요청을 하나 더 세고 반납 함수를 반환한다.
+
+        자리를 잡고 시작한 호출을 두고 호출한 쪽이 먼저 떠날 때(헤지에 진 호출) 그 호출이 실제로 끝날
+        때까지 동시 요청 한도에 잡혀 있게 하는 데 쓴다. RPM 시각은 쓰지 않는다.
+        """
+        with self._cond:
+            self.in_flight[lane] += 1
+        return lambda: self._release(lane)
+
+    def lane(self, lane):
+        return LaneLimiter(self, lane)
+
+    def snapshot(self):
+        """레인별 대기 중/실행 중 요청 수, 처리 수, 대기 시간(평균, p95)을 반환한다."""
+        with self._cond:
+            stats = {}
+            for lane in LANES:
+                waits = sorted(self._waits[lane])
+                stats[lane] = {
+                    "waiting": self.waiting[lane],
+                    "in_flight": self.in_flight[lane],
+                    "served": self.served[lane],
+                    "wait_avg": sum(waits) / len(waits) if waits else None,
+                    "wait_p95": percentile(waits, 95),
+                }
+            return stats
+
+
+class LaneLimiter:
+    """AdaptiveController의 limiter 자리에 넣어 쓰는 레인 고정 핸들."""
+
+    def __init__(self, scheduler, lane):
+        self.scheduler = scheduler
+        self.lane = lane
+
+    def slot(self):
+        return self.scheduler.slot(self.lane)
+
+    def try_slot(self):
+        return self.scheduler.try_slot(self.lane)
+
+    def hold(self):
+        return self.scheduler.hold(self.lane)
+
+
+_schedulers = {}
+_lock = threading.Lock()
+
+
+def get_scheduler(api_key, max_concurrency=16, rpm=60):
+    """API 키마다 프로세스 전체에서 하나인 스케줄러를 반환한다. 키 원문은 저장하지 않는다."""
+    key = hashlib.sha256(str(api_key).encode("utf-8")).hexdigest()
+    with _lock:
+        scheduler = _schedulers.get(key)
+        if scheduler is None:
+            scheduler = _schedulers[key] = QuotaScheduler(max_concurrency, rpm)
+    return scheduler
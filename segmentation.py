@@ -0,0 +1,144 @@
+"""긴 셀 분할 번역.
+
+기사 한 편이 통째로 들어 있는 셀은 한 번의 요청으로 보내면 가장 느리고 타임아웃도 잦다.
+기준 길이를 넘는 셀은 문단/문장 경계에서 나눠 조각마다 앞뒤 문맥을 조금씩 붙여 병렬로 번역하고,
+원래 순서와 구분 공백(문단 줄바꿈 등)을 그대로 살려 다시 합친다.
+마크다운 굵게(`**...**`)와 `{변수}` 안에서는 절대 나누지 않는다.
+"""
+import re
+from collections import namedtuple
+
+Segment = namedtuple("Segment", ["text", "before", "after"])
+
+_PROTECTED = re.compile(r"\*\*.+?\*\*|\{[^{}]*\}", re.S)
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n|\n")
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?…])[\"'”’)\]]*\s+")
+
+
+def _boundaries(text):
+    """나눌 수 있는 (공백 시작, 공백 끝) 위치 목록. 보호 구간 안의 경계는 제외한다."""
+    protected = [match.span() for match in _PROTECTED.finditer(text)]
+
+    def inside(position):
+        return any(start < position < end for start, end in protected)
+
+    spans = set()
+    for pattern in (_PARAGRAPH_BREAK, _SENTENCE_BREAK):
+        for match in pattern.finditer(text):
+            start = match.start()
+            # 문장 끝 따옴표/괄호는 앞 문장에 붙여 두고 공백만 구분자로 쓴다
+            while start < match.end() and not text[start].isspace():
+                start += 1
+            if start < match.end() and not inside(start) and not inside(match.end()):
+                spans.add((start, match.end()))
+    merged = []
+    for start, end in sorted(spans):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(end, merged[-1][1]))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def split_segments(text, max_chars=1500):
+    """text를 max_chars 이하 조각으로 나눠 [(조각, 뒤따르는 구분 공백)] 목록을 반환한다.
+
+    경계가 없어 max_chars보다 긴 문장은 나누지 않고 한 조각으로 둔다.
+    """
+    units = []
+    position = 0
+    for start, end in _boundaries(text):
+        units.append((text[position:start], text[start:end]))
+        position = end
+    units.append((text[position:], ""))
+
+    segments = []
+    current, separator = "", ""
+    for unit, unit_separator in units:
+        if current and len(current) + len(separator) + len(unit) > max_chars:
+            segments.append((current, separator))
+            current = unit
+        else:
+            current = current + separator + unit if current else unit
+        separator = unit_separator
+    segments.append((current, separator))
+    return segments
+
+
+def _tail(text, size):
+    if len(text) <= size:
+        return text
+    cut = text[-size:]
+    return cut[cut.find(" ") + 1:] if " " in cut else cut
+
+
+def _head(text, size):
+    if len(text) <= size:
+        return text
+    cut = text[:size]
+    return cut[:cut.rfind(" ")] if " " in cut else cut
+
+
+def make_segments(text, max_chars=1500, context_chars=200):
+    """조각마다 앞뒤 원문 일부를 문맥으로 붙인 Segment 목록과 구분 공백 목록을 반환한다."""
+    pieces = split_segments(text, max_chars)
+    segments = []
+    for position, (piece, _) in enumerate(pieces):
+        before = _tail(pieces[position - 1][0], context_chars) if position > 0 else ""
+        after = _head(pieces[position + 1][0], context_chars) if position + 1 < len(pieces) else ""
+        segments.append(Segment(piece, before, after))
+    return segments, [separator for _, separator in pieces]
+
+
+def translate_segmented(items, run_fn, max_chars=1500, context_chars=200, on_result=None):
+    """max_chars보다 긴 행은 조각으로 나눠 다른 행과 함께 run_fn에 넘기고, 조각이 모두 끝나면 합친다.
+
+    run_fn(items, on_result)은 translate_rows와 같은 형태이며, 조각은 ((행 번호, 조각 번호), Segment)로
+    전달된다. 조각 하나라도 실패하면 그 행은 translated=None으로 알린다.
+    """
+    items = list(items)
+    total = len(items)
+    results = {}
+    done = 0
+    expanded = []
+    pending = {}
+
+    for index, text in items:
+        if max_chars and len(text) > max_chars:
+            segments, separators = make_segments(text, max_chars, context_chars)
+            if len(segments) > 1:
+                pending[index] = {"parts": [None] * len(segments), "left": len(segments),
+                                  "failed": False, "separators": separators}
+                expanded.extend(((index, number), segment) for number, segment in enumerate(segments))
+                continue
+        expanded.append((index, text))
+
+    def report(index, translated):
+        nonlocal done
+        if translated is not None:
+            results[index] = translated
+        done += 1
+        if on_result:
+            on_result(index, translated, done, total)
+
+    def on_part_result(key, translated, _done, _total):
+        if not isinstance(key, tuple):
+            report(key, translated)
+            return
+        index, number = key
+        state = pending[index]
+        if translated is None:
+            state["failed"] = True
+        else:
+            state["parts"][number] = translated
+        state["left"] -= 1
+        if state["left"]:
+            return
+        if state["failed"]:
+            report(index, None)
+        else:
+            report(index, "".join(part + separator
+                                  for part, separator in zip(state["parts"], state["separators"])))
+
+    run_fn(expanded, on_part_result)
+    return results
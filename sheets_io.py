@@ -0,0 +1,132 @@
+"""Google Sheets 범위 읽기와 청크 단위 쓰기.
+
+get_all_values()로 시트 전체를 받지 않고 원문/대상 컬럼만 batch_get으로 읽는다.
+번역 결과는 실행 중에 일정 개수마다 batch_update로 나눠 저장하고, 실패하면 재시도한다.
+gspread Worksheet와 같은 인터페이스(batch_get, batch_update)만 사용하므로 가짜 워크시트로도 동작한다.
+"""
+import threading
+import time
+
+
+def column_letter(index):
+    """0부터 시작하는 컬럼 번호를 A, B, ..., Z, AA 형식으로 바꾼다."""
+    letters = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def column_index(letters):
+    """A, B, ..., Z, AA 형식의 컬럼 이름을 0부터 시작하는 번호로 바꾼다."""
+    index = 0
+    for letter in letters.strip().upper():
+        if not "A" <= letter <= "Z":
+            raise ValueError(f"올바른 컬럼 이름이 아닙니다: {letters}")
+        index = index * 26 + ord(letter) - 64
+    if not index:
+        raise ValueError("컬럼 이름이 비어 있습니다")
+    return index - 1
+
+
+def read_columns(worksheet, indices):
+    """지정한 컬럼만 읽어 (헤더 목록, 컬럼별 데이터 행 목록)을 반환한다. 모든 컬럼 길이는 같게 맞춘다."""
+    ranges = [f"{column_letter(index)}1:{column_letter(index)}" for index in indices]
+    value_ranges = worksheet.batch_get(ranges)
+
+    columns = []
+    for values in value_ranges:
+        columns.append([row[0] if row else "" for row in values])
+    length = max((len(column) for column in columns), default=0)
+    columns = [column + [""] * (length - len(column)) for column in columns]
+
+    headers = [column[0] if column else "" for column in columns]
+    headers = [header or f"Column_{column_letter(index)}" for header, index in zip(headers, indices)]
+    return headers, [column[1:] for column in columns]
+
+
+class ChunkedSheetWriter:
+    """번역된 셀을 모아 두었다가 chunk_size개마다 한 번에 기록한다.
+
+    row_index는 데이터 행 번호(헤더 제외, 0부터)이며 시트에서는 row_index + 2 행에 쓴다.
+    add_cell로 여러 컬럼의 셀을 섞어 넣어도 한 번의 batch_update로 함께 저장한다.
+    """
+
+    def __init__(self, worksheet, col_index=None, chunk_size=200, max_retries=3, backoff=1.0):
+        self.worksheet = worksheet
+        self.col_letter = column_letter(col_index) if col_index is not None else None
+        self.chunk_size = chunk_size
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.written = 0
+        self.failed = {}
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def add(self, row_index, value):
+        self._add((self.col_letter, row_index), value)
+
+    def add_cell(self, row_index, col_index, value):
+        self._add((column_letter(col_index), row_index), value)
+
+    def _add(self, cell, value):
+        with self._lock:
+            self._pending[cell] = value
+            if len(self._pending) < self.chunk_size:
+                return
+            pending = self._pending
+            self._pending = {}
+        self._write(pending)
+
+    def flush(self):
+        with self._lock:
+            pending = self._pending
+            self._pending = {}
+        if pending:
+            self._write(pending)
+
+    def close(self):
+        self.flush()
+        # 실행 중 실패한 청크는 마지막에 한 번 더 시도
+        if self.failed:
+            failed = self.failed
+            self.failed = {}
+            self._write(failed)
+
+    def _ranges(self, pending):
+        # 컬럼별로 연속된 행을 하나의 범위로 묶는다
+        data = []
+        run_start = None
+        run_values = []
+        previous = None
+        for col_letter, row_index in sorted(pending, key=lambda cell: (len(cell[0]), cell[0], cell[1])):
+            if previous is not None and (col_letter, row_index) != (previous[0], previous[1] + 1):
+                data.append(self._range(previous[0], run_start, run_values))
+                run_start, run_values = None, []
+            if run_start is None:
+                run_start = row_index
+            run_values.append([pending[(col_letter, row_index)]])
+            previous = (col_letter, row_index)
+        if run_values:
+            data.append(self._range(previous[0], run_start, run_values))
+        return data
+
+    def _range(self, col_letter, start, values):
+        first = start + 2
+        last = first + len(values) - 1
+        return {"range": f"{col_letter}{first}:{col_letter}{last}", "values": values}
+
+    def _write(self, pending):
+        data = self._ranges(pending)
+        for attempt in range(self.max_retries + 1):
+            try:
+                self.worksheet.batch_update(data, value_input_option="RAW")
+                self.written += len(pending)
+                return
+            except Exception:
+                if attempt == self.max_retries:
+                    break
+                time.sleep(self.backoff * (2 ** attempt))
+        with self._lock:
+            self.failed.update(pending)
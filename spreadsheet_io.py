@@ -0,0 +1,146 @@
+"""대용량 엑셀/CSV 파일용 스트리밍 입출력.
+
+파일 전체를 DataFrame으로 올리지 않고 행을 청크 단위로 읽어 바로 번역에 넘기고,
+번역된 청크는 constant_memory 모드의 xlsxwriter(또는 csv.writer)로 임시 파일에 곧바로 쓴다.
+메모리에는 항상 청크 하나만 남으므로 20만 행 파일도 최대 메모리 사용량이 일정하다.
+"""
+import csv
+import os
+import tempfile
+
+
+def iter_rows(path, is_csv):
+    """헤더를 포함한 모든 행을 리스트로 하나씩 돌려준다."""
+    if is_csv:
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            for row in csv.reader(f):
+                yield row
+        return
+
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        worksheet = workbook.worksheets[0]
+        for row in worksheet.iter_rows(values_only=True):
+            yield ["" if value is None else value for value in row]
+    finally:
+        workbook.close()
+
+
+def count_rows(path, is_csv):
+    """헤더를 뺀 데이터 행 수 (진행률/ETA용). xlsx는 시트에 기록된 크기(max_row)를 쓰고, 없으면 직접 센다."""
+    if not is_csv:
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(path, read_only=True)
+        try:
+            max_row = workbook.worksheets[0].max_row
+        finally:
+            workbook.close()
+        if max_row is not None:
+            return max(max_row - 1, 0)
+    rows = iter_rows(path, is_csv)
+    try:
+        return max(sum(1 for _ in rows) - 1, 0)
+    finally:
+        rows.close()
+
+
+class RowWriter:
+    """xlsx는 constant_memory 모드, csv는 csv.writer로 한 행씩 기록한다."""
+
+    def __init__(self, path, is_csv):
+        self.path = path
+        self.is_csv = is_csv
+        if is_csv:
+            self._file = open(path, "w", newline="", encoding="utf-8-sig")
+            self._writer = csv.writer(self._file)
+        else:
+            import xlsxwriter
+
+            self._workbook = xlsxwriter.Workbook(path, {"constant_memory": True, "strings_to_urls": False})
+            self._worksheet = self._workbook.add_worksheet("Sheet1")
+        self._row = 0
+
+    def write(self, values):
+        if self.is_csv:
+            self._writer.writerow(values)
+        else:
+            self._worksheet.write_row(self._row, 0, values)
+        self._row += 1
+
+    def close(self):
+        if self.is_csv:
+            self._file.close()
+        else:
+            self._workbook.close()
+
+
+def _cell_text(value):
+    if value is None:
+        return ""
+    return str(value)
+
+
+def stream_translate_file(src_path, is_csv, idx_src, idx_tgt, target_header, translate_chunk,
+                          chunk_size=2000, out_path=None, on_progress=None, skip_row=None):
+    """src_path를 청크 단위로 읽고 번역해서 out_path(기본값: 임시 파일)에 쓴 뒤 경로를 반환한다.
+
+    translate_chunk(items)는 (행 번호, 원문) 목록을 받아 {행 번호: 번역}을 반환한다.
+    on_progress(rows_done)는 청크가 기록될 때마다 호출된다.
+    skip_row(행 번호, 원문, 기존 번역)가 True를 반환한 행은 번역하지 않고 그대로 쓴다.
+    """
+    if out_path is None:
+        suffix = ".csv" if is_csv else ".xlsx"
+        fd, out_path = tempfile.mkstemp(prefix="translated_", suffix=suffix)
+        os.close(fd)
+
+    rows = iter_rows(src_path, is_csv)
+    writer = RowWriter(out_path, is_csv)
+    try:
+        header = list(next(rows, []))
+        # 기존 업로드 번역과 같이, 대상 컬럼이 없으면 맨 끝에 새 컬럼을 추가
+        if len(header) <= idx_tgt:
+            header.append(target_header)
+            idx_tgt = len(header) - 1
+        width = len(header)
+        writer.write(header)
+
+        rows_done = 0
+        chunk = []
+
+        def flush():
+            nonlocal rows_done
+            items = []
+            for offset, row in enumerate(chunk):
+                source_text = _cell_text(row[idx_src]) if idx_src < len(row) else ""
+                if not source_text.strip():
+                    continue
+                if skip_row:
+                    target_text = _cell_text(row[idx_tgt]) if idx_tgt < len(row) else ""
+                    if skip_row(rows_done + offset, source_text, target_text):
+                        continue
+                items.append((rows_done + offset, source_text))
+            results = translate_chunk(items) if items else {}
+            for offset, row in enumerate(chunk):
+                row = list(row) + [""] * (width - len(row))
+                if rows_done + offset in results:
+                    row[idx_tgt] = results[rows_done + offset]
+                writer.write(row)
+            rows_done += len(chunk)
+            chunk.clear()
+            if on_progress:
+                on_progress(rows_done)
+
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                flush()
+        if chunk:
+            flush()
+    finally:
+        writer.close()
+        rows.close()
+
+    return out_path
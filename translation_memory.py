@@ -0,0 +1,208 @@
+"""디스크 기반 번역 메모리 (SQLite).
+
+키는 정규화된 원문 + 카테고리 + 레벨 + 모델 이름 + 렌더링된 master_prompt 해시이다.
+지침이 바뀌면 해당 카테고리/레벨 조합의 프롬프트 해시만 달라지므로 그 항목만 무효화된다.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+
+DEFAULT_PATH = os.path.join(".translation_cache", "translation_memory.sqlite3")
+
+
+def normalize_source(text):
+    text = unicodedata.normalize("NFC", str(text))
+    return " ".join(text.split())
+
+
+def prompt_version(prompt):
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:16]
+
+
+class TranslationMemory:
+    def __init__(self, path=DEFAULT_PATH, max_entries=200000):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS memory (
+                key TEXT PRIMARY KEY,
+                category TEXT,
+                level TEXT,
+                model TEXT,
+                prompt_hash TEXT,
+                source TEXT,
+                translation TEXT,
+                last_used REAL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_memory_last_used ON memory(last_used)")
+        self._conn.commit()
+        # 항목이 많아도 put마다 COUNT(*)를 하지 않도록 개수를 메모리에서 관리
+        self._count = self._conn.execute("SELECT COUNT(*) FROM memory").fetchone()[0]
+
+    @staticmethod
+    def make_key(source, category, level, model, prompt_hash):
+        raw = "\x1f".join([normalize_source(source), category, level, model, prompt_hash])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, source, category, level, model, prompt_hash):
+        key = self.make_key(source, category, level, model, prompt_hash)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT translation FROM memory WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._conn.execute("UPDATE memory SET last_used = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+        return row[0]
+
+    def put(self, source, category, level, model, prompt_hash, translation):
+        key = self.make_key(source, category, level, model, prompt_hash)
+        with self._lock:
+            now = time.time()
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO memory VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, category, level, model, prompt_hash, normalize_source(source), translation, now)
+            )
+            # 새 항목일 때만 개수가 늘고, 이미 있으면 번역만 바꾼다
+            if cursor.rowcount:
+                self._count += 1
+            else:
+                self._conn.execute(
+                    "UPDATE memory SET translation = ?, last_used = ? WHERE key = ?", (translation, now, key)
+                )
+            self._conn.commit()
+            self._evict()
+
+    def purge_stale(self, category, level, model, prompt_hash):
+        """같은 카테고리/레벨/모델에서 현재 프롬프트 해시와 다른 항목을 삭제한다."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM memory WHERE category = ? AND level = ? AND model = ? AND prompt_hash != ?",
+                (category, level, model, prompt_hash)
+            )
+            self._count -= cursor.rowcount
+            self._conn.commit()
+        return cursor.rowcount
+
+    def _evict(self):
+        if self._count <= self.max_entries:
+            return
+        # 오래 사용되지 않은 항목부터 최대 크기의 90%까지 정리
+        remove = self._count - int(self.max_entries * 0.9)
+        self._count -= self._conn.execute(
+            "DELETE FROM memory WHERE key IN (SELECT key FROM memory ORDER BY last_used LIMIT ?)",
+            (remove,)
+        ).rowcount
+        self._conn.commit()
+
+    def __len__(self):
+        return self._count
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+def translate_with_memory(items, run_fn, memory, category, level, model, prompt_hash, on_result=None,
+                          fuzzy=None):
+    """번역 메모리 조회와 실행 중 중복 제거를 거친 뒤 남은 행만 run_fn으로 번역한다.
+
+    run_fn(items, on_result)은 translate_rows / translate_rows_batched와 같은 형태이다.
+    fuzzy(FuzzyMemory)를 넘기면 숫자/{변수}만 다른 원문도 재사용하고, 같은 템플릿의 행은
+    한 행만 먼저 번역한 뒤 나머지는 그 번역에 값만 바꿔 채운다.
+    실패한 행(translated=None)은 메모리에 저장하지 않는다.
+    """
+    items = list(items)
+    total = len(items)
+    results = {}
+    done = 0
+
+    def report(index, translated):
+        nonlocal done
+        if translated is not None:
+            results[index] = translated
+        done += 1
+        if on_result:
+            on_result(index, translated, done, total)
+
+    def lookup(text):
+        cached = memory.get(text, category, level, model, prompt_hash) if memory is not None else None
+        if cached is None and fuzzy is not None:
+            cached = fuzzy.get(text, category, level, model, prompt_hash)
+        return cached
+
+    # 동일한 원문은 한 번만 요청
+    groups = {}
+    for index, text in items:
+        groups.setdefault(normalize_source(text), []).append((index, text))
+
+    pending = []
+    for indices in groups.values():
+        first_index, text = indices[0]
+        cached = lookup(text)
+        if cached is not None:
+            for index, _ in indices:
+                report(index, cached)
+        else:
+            pending.append((first_index, text))
+
+    # 템플릿이 같은 원문은 대표 한 행만 먼저 보내고 나머지는 보류
+    held = []
+    if fuzzy is not None:
+        first_pass = []
+        seen_templates = set()
+        for first_index, text in pending:
+            template, values = fuzzy.mask(text)
+            if values and template in seen_templates:
+                held.append((first_index, text))
+            else:
+                seen_templates.add(template)
+                first_pass.append((first_index, text))
+        pending = first_pass
+
+    representatives = {first_index: groups[normalize_source(text)] for first_index, text in pending + held}
+
+    def on_unique_result(first_index, translated, _done, _total):
+        indices = representatives[first_index]
+        if translated is not None:
+            if memory is not None:
+                memory.put(indices[0][1], category, level, model, prompt_hash, translated)
+            if fuzzy is not None:
+                fuzzy.put(indices[0][1], category, level, model, prompt_hash, translated)
+        for index, _ in indices:
+            report(index, translated)
+
+    run_fn(pending, on_unique_result)
+
+    # 대표 행의 번역에서 템플릿을 얻지 못한(또는 실패한) 보류 행만 따로 번역
+    leftover = []
+    for first_index, text in held:
+        cached = fuzzy.get(text, category, level, model, prompt_hash)
+        if cached is not None:
+            on_unique_result(first_index, cached, 0, 0)
+        else:
+            leftover.append((first_index, text))
+    if leftover:
+        run_fn(leftover, on_unique_result)
+    return results
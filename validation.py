@@ -0,0 +1,268 @@
+"""번역 결과 로컬 검수와 규칙 위반 행만 골라 다시 번역하기.
+
+ground_rules / common_errors 중 기계적으로 확인할 수 있는 규칙을 정규식으로 검사한다.
+- forbidden_word: '당신' 같은 금지어 사용
+- placeholder_parity: 원문과 번역의 `{변수}` 목록이 다름
+- bold_parity: 원문과 번역의 `**굵게**` 개수가 다름
+- number_consistency: 원문의 숫자가 번역에 없음 (만/억 단위 표기는 같은 값으로 인정)
+- mixed_endings: 한 행 또는 한 문서 안에서 "-요"/"-습니다" 혼용
+
+위반한 행만 위반 내용을 힌트로 붙여 한 번 더 요청하고, 행별 결과와 규칙별 집계를 ValidationReport에 남긴다.
+"""
+import re
+import threading
+from collections import Counter, namedtuple
+
+Correction = namedtuple("Correction", ["value", "hint", "previous"])
+
+FORBIDDEN_WORDS = {
+    "당신": "Never translate 'you' as '당신'; omit the subject or use a context-appropriate title.",
+}
+
+RULE_LABELS = {
+    "forbidden_word": "금지어",
+    "placeholder_parity": "변수 보존",
+    "bold_parity": "굵게 표시 보존",
+    "number_consistency": "숫자 일치",
+    "mixed_endings": "-요/-습니다 혼용",
+}
+
+STYLE_LABELS = {"yo": "-요", "formal": "-습니다"}
+
+_PLACEHOLDER = re.compile(r"\{[^{}\s]+\}")
+_BOLD = re.compile(r"\*\*(.+?)\*\*", re.S)
+_SOURCE_NUMBER = re.compile(
+    r"(?<![\w.])(\d+(?:,\d{3})*(?:\.\d+)?)(?:\s*(thousand|million|billion|trillion|k|m|bn)\b)?", re.I
+)
+_TARGET_NUMBER = re.compile(r"(\d+(?:,\d{3})*(?:\.\d+)?)\s*(천만|백만|십만|천|백|만|억|조)?")
+_SOURCE_SCALES = {"thousand": 1e3, "k": 1e3, "million": 1e6, "m": 1e6, "billion": 1e9, "bn": 1e9, "trillion": 1e12}
+_TARGET_SCALES = {"백": 1e2, "천": 1e3, "만": 1e4, "십만": 1e5, "백만": 1e6, "천만": 1e7, "억": 1e8, "조": 1e12}
+_QUOTED = re.compile(r"\"[^\"]*\"|“[^”]*”|'[^']*'|‘[^’]*’")
+_SENTENCE_END = re.compile(r"[.!?…。\n]+")
+
+
+def source_numbers(text):
+    values = []
+    for number, scale in _SOURCE_NUMBER.findall(text):
+        value = float(number.replace(",", ""))
+        values.append(value * _SOURCE_SCALES.get(scale.lower(), 1) if scale else value)
+    return values
+
+
+def target_numbers(text):
+    """번역문의 숫자 값 집합. "1억 2천만"처럼 단위가 이어지면 합친 값도 넣는다."""
+    values = set()
+    compound, last_end, last_scale = 0.0, None, None
+    for match in _TARGET_NUMBER.finditer(text):
+        value = float(match.group(1).replace(",", ""))
+        scale = _TARGET_SCALES.get(match.group(2) or "", 1)
+        values.add(value)
+        values.add(value * scale)
+        if last_end is not None and text[last_end:match.start()].strip() == "" and last_scale and scale < last_scale:
+            compound += value * scale
+        else:
+            compound = value * scale
+        values.add(compound)
+        last_end, last_scale = match.end(), scale
+    return values
+
+
+def ending_style(text):
+    """따옴표 밖 문장 끝을 보고 'yo', 'formal', 'mixed', None 중 하나를 반환한다."""
+    styles = set()
+    for sentence in _SENTENCE_END.split(_QUOTED.sub("", text)):
+        sentence = sentence.strip().rstrip("\"'”’)]~ ")
+        if sentence.endswith("요"):
+            styles.add("yo")
+        elif sentence.endswith(("니다", "니까", "시오")):
+            styles.add("formal")
+    if len(styles) > 1:
+        return "mixed"
+    return styles.pop() if styles else None
+
+
+def check_row(source, translation):
+    """행 하나를 검사해 [(규칙, 설명)] 목록을 반환한다. 문서 단위 어미 비교는 translate_validated가 한다."""
+    violations = []
+    for word, rule in FORBIDDEN_WORDS.items():
+        if word in translation:
+            violations.append(("forbidden_word", f"'{word}' 사용. {rule}"))
+
+    expected = Counter(_PLACEHOLDER.findall(source))
+    actual = Counter(_PLACEHOLDER.findall(translation))
+    if expected != actual:
+        missing = sorted((expected - actual).elements())
+        extra = sorted((actual - expected).elements())
+        detail = []
+        if missing:
+            detail.append(f"missing {', '.join(missing)}")
+        if extra:
+            detail.append(f"unexpected {', '.join(extra)}")
+        violations.append(("placeholder_parity", "; ".join(detail)))
+
+    expected_bold = len(_BOLD.findall(source))
+    actual_bold = len(_BOLD.findall(translation))
+    if expected_bold != actual_bold or translation.count("**") % 2:
+        violations.append(("bold_parity", f"source has {expected_bold} **bold** spans, translation has {actual_bold}"))
+
+    found = target_numbers(translation)
+    # 10 이하의 수는 "세 개", "첫 번째"처럼 한글로 옮기는 경우가 많아 검사하지 않음
+    missing_numbers = [value for value in source_numbers(_PLACEHOLDER.sub("", source))
+                       if value > 10 and not any(abs(value - other) < 1e-6 * max(1.0, value) for other in found)]
+    if missing_numbers:
+        shown = ", ".join(f"{value:g}" for value in missing_numbers[:5])
+        violations.append(("number_consistency", f"numbers missing from translation: {shown}"))
+
+    if ending_style(translation) == "mixed":
+        violations.append(("mixed_endings", "mixes -요 and -습니다 endings within the row"))
+    return violations
+
+
+def make_hint(violations, expected_style=None):
+    lines = [f"- {RULE_LABELS[rule]} ({rule}): {detail}" for rule, detail in violations]
+    if expected_style:
+        lines.append(f"- Use the {STYLE_LABELS[expected_style]} ending consistently, like the rest of the document.")
+    return "\n".join(lines)
+
+
+class ValidationReport:
+    def __init__(self):
+        self.checked = 0
+        self.detected = Counter()
+        self.fixed = Counter()
+        self.remaining = Counter()
+        self.rows = {}
+        self._lock = threading.Lock()
+
+    def record(self, key, found, remaining):
+        """found: 처음 번역에서 찾은 위반, remaining: 다시 번역한 뒤에도 남은 위반."""
+        row = key[0] if isinstance(key, tuple) else key
+        with self._lock:
+            self.checked += 1
+            found_rules = {rule for rule, _ in found}
+            remaining_rules = {rule for rule, _ in remaining}
+            self.detected.update(found_rules)
+            self.fixed.update(found_rules - remaining_rules)
+            self.remaining.update(remaining_rules)
+            if remaining:
+                self.rows.setdefault(row, []).extend(remaining)
+
+    def add_remaining(self, key, rule, detail):
+        """검수 뒤에 드러난 위반(예: 최종 다수 어미와 다름)을 재번역 없이 기록한다."""
+        row = key[0] if isinstance(key, tuple) else key
+        with self._lock:
+            violations = self.rows.setdefault(row, [])
+            if any(existing == rule for existing, _ in violations):
+                return
+            violations.append((rule, detail))
+            self.detected[rule] += 1
+            self.remaining[rule] += 1
+
+    def summary(self):
+        with self._lock:
+            return {
+                rule: {"detected": self.detected[rule], "fixed": self.fixed[rule], "remaining": self.remaining[rule]}
+                for rule in RULE_LABELS
+            }
+
+    def describe(self):
+        summary = self.summary()
+        found = sum(counts["detected"] for counts in summary.values())
+        fixed = sum(counts["fixed"] for counts in summary.values())
+        return f"검수 {self.checked}행 · 위반 {found}건 중 {fixed}건 재번역으로 해결 · 남은 행 {len(self.rows)}"
+
+
+def _source_text(value):
+    return getattr(value, "text", value)
+
+
+def translate_validated(items, run_fn, report, on_result=None, warmup=10, dominance=0.7):
+    """run_fn으로 번역한 결과를 검수하고, 위반한 행만 힌트와 함께 한 번 더 run_fn에 보낸다.
+
+    run_fn(items, on_result)은 translate_rows와 같은 형태이며, 재번역 행의 값은 Correction이다.
+    통과한 행은 바로 on_result로 알리고, 위반 행은 재번역 결과가 나아졌을 때만 교체한다.
+    문서 어미는 지금까지 통과한 행의 다수 어미(warmup행 이상, 비율 dominance 이상)와 비교하고,
+    끝난 뒤 최종 다수와 다른 행은 재번역 없이 보고서에만 남긴다.
+    """
+    items = list(items)
+    total = len(items)
+    sources = {key: _source_text(value) for key, value in items}
+    results = {}
+    done = 0
+    styles = Counter()
+    accepted_styles = {}
+    held = {}
+
+    def majority():
+        counted = styles["yo"] + styles["formal"]
+        if counted < warmup:
+            return None
+        style, count = max(styles.items(), key=lambda entry: entry[1])
+        return style if count / counted >= dominance else None
+
+    def check(key, translated):
+        violations = check_row(sources[key], translated)
+        style = ending_style(translated)
+        expected = majority()
+        if style in STYLE_LABELS and expected and style != expected:
+            violations.append(("mixed_endings",
+                               f"uses {STYLE_LABELS[style]} but the document uses {STYLE_LABELS[expected]}"))
+        return violations, style, expected
+
+    def report_row(key, translated, found, remaining, style):
+        nonlocal done
+        if translated is not None:
+            results[key] = translated
+            report.record(key, found, remaining)
+            if style in STYLE_LABELS:
+                styles[style] += 1
+                accepted_styles[key] = style
+        done += 1
+        if on_result:
+            on_result(key, translated, done, total)
+
+    def on_first_result(key, translated, _done, _total):
+        if translated is None:
+            report_row(key, None, [], [], None)
+            return
+        violations, style, expected = check(key, translated)
+        if violations:
+            held[key] = (translated, violations, style, expected)
+        else:
+            report_row(key, translated, [], [], style)
+
+    run_fn(items, on_first_result)
+    if not held:
+        return _finish_document(results, accepted_styles, report, warmup, dominance)
+
+    corrections = []
+    values = dict(items)
+    for key, (translated, violations, _, expected) in held.items():
+        hint = make_hint(violations, expected)
+        corrections.append((key, Correction(values[key], hint, translated)))
+
+    def on_fixed_result(key, translated, _done, _total):
+        previous, violations, style, _ = held[key]
+        if translated is not None:
+            new_violations, new_style, _ = check(key, translated)
+            if len(new_violations) < len(violations):
+                report_row(key, translated, violations, new_violations, new_style)
+                return
+        report_row(key, previous, violations, violations, style)
+
+    run_fn(corrections, on_fixed_result)
+    return _finish_document(results, accepted_styles, report, warmup, dominance)
+
+
+def _finish_document(results, accepted_styles, report, warmup, dominance):
+    # 다수 어미가 정해지기 전에 통과한 행도 최종 다수와 비교해 보고서에 남긴다
+    counts = Counter(accepted_styles.values())
+    counted = sum(counts.values())
+    if counted >= warmup:
+        style, count = counts.most_common(1)[0]
+        if count / counted >= dominance:
+            for key, row_style in accepted_styles.items():
+                if row_style != style:
+                    report.add_remaining(key, "mixed_endings",
+                                         f"uses {STYLE_LABELS[row_style]} but the document uses {STYLE_LABELS[style]}")
+    return results